@@ -4,6 +4,25 @@
 from typing import List, Dict, Optional, Any
 import json
 import base64
+import hashlib
+import math
+import os
+import re
+
+from embedding_cache import EmbeddingCache
+from embedding_pipeline import EmbeddingBatcher
+from vector_index import VectorIndex
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+EMBEDDING_DIMENSION = 1536  # Standard embedding size
+EMBEDDING_MODEL = "feature-hash-1536-v1"  # Cache key namespace - change when the embedding changes
+
+_TOKEN = re.compile(r"\w+")
 
 class AdvancedAIFeatures:
     """
@@ -20,48 +39,121 @@ class AdvancedAIFeatures:
     - Agentic Systems
     """
     
-    def __init__(self):
-        self.vector_db = {}
-        self.embeddings_cache = {}
+    def __init__(self, storage_dir: Optional[str] = None, embedding_cache_path: Optional[str] = None):
+        # With a storage directory (or VECTOR_STORE_DIR) collections are memory-mapped
+        # files that survive restarts and are shared between worker processes
+        storage_dir = storage_dir or os.getenv('VECTOR_STORE_DIR')
+        if storage_dir:
+            os.makedirs(storage_dir, exist_ok=True)
+        self.vector_db = VectorIndex(storage_dir)
+        # Embeddings persist next to the collections (or at EMBEDDING_CACHE_PATH);
+        # with neither configured the cache is memory-only
+        cache_path = embedding_cache_path or os.getenv('EMBEDDING_CACHE_PATH')
+        if not cache_path and storage_dir:
+            cache_path = os.path.join(storage_dir, 'embeddings.db')
+        self.embedding_cache = EmbeddingCache(
+            EMBEDDING_MODEL,
+            path=cache_path,
+            max_bytes=int(os.getenv('EMBEDDING_CACHE_MB', '64')) * 1024 * 1024
+        ) if NUMPY_AVAILABLE else None
+        # Cache misses from every caller (bulk indexing, searches, concurrent
+        # /research and rag_query calls) share backend batches
+        self.embedding_batcher = EmbeddingBatcher(
+            self._embed_backend,
+            max_batch_size=int(os.getenv('EMBEDDING_BATCH_SIZE', '64')),
+            max_delay=float(os.getenv('EMBEDDING_BATCH_DELAY_MS', '5')) / 1000
+        )
         self.tools = []
         self.memory = []
     
+    def close(self) -> None:
+        """Stop the embedding worker and close the cache and open collections"""
+        self.embedding_batcher.close()
+        if self.embedding_cache is not None:
+            self.embedding_cache.close()
+        self.vector_db.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
     # ==================== RAG (Retrieval Augmented Generation) ====================
     
-    def create_vector_database(self, documents: List[str], collection_name: str = "default") -> Dict:
+    def create_vector_database(self, documents: List[str], collection_name: str = "default",
+                               index_type: Optional[str] = None, **index_options) -> Dict:
         """
         Create vector database for RAG
         
         Args:
             documents: List of documents to embed
             collection_name: Name of collection
+            index_type: "exact" (scores every document), "ivf" (approximate,
+                        for millions of chunks) or "disk" (memory-mapped files in
+                        the storage directory; the default when there is one)
+            **index_options: IVF settings - nlist, nprobe, train_size;
+                             disk settings - merge_threshold
             
         Returns:
             Database info
         """
-        embeddings = []
-        
-        for doc in documents:
-            # Simulate embedding generation
-            embedding = self._generate_embedding(doc)
-            embeddings.append({
-                "text": doc,
-                "embedding": embedding,
-                "metadata": {
-                    "length": len(doc),
-                    "collection": collection_name
-                }
-            })
-        
-        self.vector_db[collection_name] = embeddings
+        index_type = index_type or ("disk" if self.vector_db.directory else "exact")
+        self.vector_db.create(collection_name, EMBEDDING_DIMENSION, mode=index_type, **index_options)
+        self.add_documents(documents, collection_name)
         
         return {
             "collection": collection_name,
             "documents": len(documents),
-            "dimension": 1536,  # Standard embedding size
+            "dimension": EMBEDDING_DIMENSION,
+            "index_type": index_type,
             "status": "created"
         }
     
+    def save_vector_database(self, collection_name: str, path: str) -> bool:
+        """Write a collection (vectors, documents and any IVF clusters) to disk"""
+        collection = self.vector_db.get(collection_name)
+        if collection is None:
+            return False
+        if not hasattr(collection, "save"):
+            # Disk collections are already files; just merge pending segments
+            collection.compact()
+            return True
+        collection.save(path)
+        return True
+    
+    def load_vector_database(self, path: str, collection_name: Optional[str] = None) -> Dict:
+        """Load a collection saved with save_vector_database"""
+        collection = self.vector_db.load(path, collection_name)
+        return {
+            "collection": collection.name,
+            "documents": len(collection),
+            "dimension": collection.dimension,
+            "status": "loaded"
+        }
+    
+    def add_documents(self, documents: List[str], collection_name: str = "default") -> List[int]:
+        """
+        Embed and add documents to a collection (created if missing)
+        
+        Returns:
+            IDs of the new documents
+        """
+        collection = self.vector_db.get(collection_name)
+        if collection is None:
+            collection = self.vector_db.create(collection_name, EMBEDDING_DIMENSION,
+                                               mode="disk" if self.vector_db.directory else "exact")
+        if not documents:
+            return []
+        
+        metadata = [{"length": len(doc), "collection": collection_name} for doc in documents]
+        return collection.add(self._embed_texts(documents), documents, metadata)
+    
+    def delete_documents(self, ids: List[int], collection_name: str = "default") -> int:
+        """Remove documents by ID; returns how many were removed"""
+        collection = self.vector_db.get(collection_name)
+        return collection.delete(ids) if collection is not None else 0
+    
     def semantic_search(self, query: str, collection_name: str = "default", top_k: int = 5) -> List[Dict]:
         """
         Semantic search using vector similarity
@@ -74,22 +166,21 @@ class AdvancedAIFeatures:
         Returns:
             Top matching documents
         """
-        if collection_name not in self.vector_db:
+        collection = self.vector_db.get(collection_name)
+        if collection is None:
             return []
         
-        query_embedding = self._generate_embedding(query)
-        
-        # Simulate similarity search
+        # Scores every document in one matrix-vector product
         results = []
-        for item in self.vector_db[collection_name][:top_k]:
-            similarity = self._cosine_similarity(query_embedding, item["embedding"])
+        for doc_id, score in collection.search(self._embed_texts([query])[0], top_k):
+            document = collection.get(doc_id)
             results.append({
-                "text": item["text"],
-                "score": similarity,
-                "metadata": item["metadata"]
+                "text": document["text"],
+                "score": score,
+                "metadata": {**document["metadata"], "id": doc_id}
             })
         
-        return sorted(results, key=lambda x: x["score"], reverse=True)
+        return results
     
     def rag_query(self, query: str, collection_name: str = "default") -> Dict:
         """
@@ -119,12 +210,44 @@ class AdvancedAIFeatures:
     
     def _generate_embedding(self, text: str) -> List[float]:
         """Generate text embedding (simulated)"""
-        # In real implementation, use OpenAI/Cohere/etc embeddings
-        return [0.1] * 1536  # Simulated 1536-dim embedding
+        return self._embed_texts([text])[0].tolist()
+    
+    def _embed_texts(self, texts: List[str]) -> "np.ndarray":
+        """Embed texts as a (len(texts), EMBEDDING_DIMENSION) float32 array, through the cache"""
+        if self.embedding_cache is None:
+            raise ImportError("numpy is required for embeddings (pip install numpy)")
+        if not texts:
+            return np.zeros((0, EMBEDDING_DIMENSION), dtype=np.float32)
+        return self.embedding_cache.embed(texts, self.embedding_batcher.embed)
+    
+    def _embed_backend(self, texts: List[str]) -> "np.ndarray":
+        """
+        Embedding model call for a batch of uncached texts
+        
+        Simulated with feature hashing: each word adds +/-1 to a hashed
+        dimension, so texts sharing words score as similar. In a real
+        implementation, use OpenAI/Cohere/etc embeddings.
+        """
+        embeddings = np.zeros((len(texts), EMBEDDING_DIMENSION), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in _TOKEN.findall(text.lower()):
+                digest = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+                embeddings[row, digest % EMBEDDING_DIMENSION] += 1.0 if digest >> 63 else -1.0
+        return embeddings
+    
+    def embedding_cache_stats(self) -> Dict:
+        """Embedding cache hit rates (memory / persistent tiers)"""
+        return self.embedding_cache.stats() if self.embedding_cache is not None else {}
+    
+    def embedding_batch_stats(self) -> Dict:
+        """Embedding micro-batch sizes and queueing delay"""
+        return self.embedding_batcher.stats()
     
     def _cosine_similarity(self, vec1: List[float], vec2: List[float]) -> float:
         """Calculate cosine similarity"""
-        return 0.85  # Simulated similarity score
+        dot = sum(a * b for a, b in zip(vec1, vec2))
+        norm = math.sqrt(sum(a * a for a in vec1)) * math.sqrt(sum(b * b for b in vec2))
+        return dot / norm if norm else 0.0
     
     # ==================== Multimodal (Vision, Audio, Video) ====================
     
@@ -565,31 +688,28 @@ print(output)
 
 def demo_rag():
     """Demo RAG capabilities"""
-    ai = AdvancedAIFeatures()
-    
-    # Create knowledge base
-    docs = [
-        "HotStuff is a DeFi-native L1 blockchain with zero gas fees",
-        "Airdrops are token distributions to early users",
-        "Always verify project legitimacy before participating"
-    ]
-    
-    ai.create_vector_database(docs, "crypto_knowledge")
-    
-    # Query with RAG
-    result = ai.rag_query("What is HotStuff?", "crypto_knowledge")
-    return result
+    with AdvancedAIFeatures() as ai:
+        # Create knowledge base
+        docs = [
+            "HotStuff is a DeFi-native L1 blockchain with zero gas fees",
+            "Airdrops are token distributions to early users",
+            "Always verify project legitimacy before participating"
+        ]
+        
+        ai.create_vector_database(docs, "crypto_knowledge")
+        
+        # Query with RAG
+        return ai.rag_query("What is HotStuff?", "crypto_knowledge")
 
 
 def demo_multimodal():
     """Demo multimodal capabilities"""
-    ai = AdvancedAIFeatures()
-    
-    # Analyze image
-    image_analysis = ai.analyze_image("https://example.com/chart.png")
-    
-    # Analyze audio
-    audio_analysis = ai.analyze_audio("https://example.com/podcast.mp3")
+    with AdvancedAIFeatures() as ai:
+        # Analyze image
+        image_analysis = ai.analyze_image("https://example.com/chart.png")
+        
+        # Analyze audio
+        audio_analysis = ai.analyze_audio("https://example.com/podcast.mp3")
     
     return {
         "image": image_analysis,
@@ -599,18 +719,14 @@ def demo_multimodal():
 
 def demo_agentic():
     """Demo agentic workflow"""
-    ai = AdvancedAIFeatures()
-    
-    workflow = ai.agentic_workflow("Find and analyze top 3 airdrops")
-    return workflow
+    with AdvancedAIFeatures() as ai:
+        return ai.agentic_workflow("Find and analyze top 3 airdrops")
 
 
 if __name__ == "__main__":
     print("Advanced AI Features Module")
     print("=" * 50)
     
-    ai = AdvancedAIFeatures()
-    
     # Test RAG
     print("\n📚 Testing RAG...")
     rag_result = demo_rag()
@@ -626,4 +742,5 @@ if __name__ == "__main__":
     agentic_result = demo_agentic()
     print(f"✅ Workflow completed with {len(agentic_result['execution'])} steps")
     
-    print("\n" + ai.get_features_info())
+    with AdvancedAIFeatures() as ai:
+        print("\n" + ai.get_features_info())
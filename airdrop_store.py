@@ -0,0 +1,268 @@
+"""
+Airdrop Store - persistent SQLite history of every scanned airdrop
+WAL mode, indexed lookups, and one transaction per scan batch.
+Each row keeps a content hash so a scan can be diffed against the last one.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import datetime
+
+from dedup import identity_keys
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS airdrops (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT,
+    value TEXT,
+    link TEXT,
+    data TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    content_hash TEXT,
+    active INTEGER NOT NULL DEFAULT 1,
+    dedup_keys TEXT,
+    UNIQUE (name, source)
+);
+CREATE INDEX IF NOT EXISTS idx_airdrops_name ON airdrops (name);
+CREATE INDEX IF NOT EXISTS idx_airdrops_source ON airdrops (source);
+CREATE INDEX IF NOT EXISTS idx_airdrops_status ON airdrops (status);
+CREATE INDEX IF NOT EXISTS idx_airdrops_first_seen ON airdrops (first_seen);
+CREATE INDEX IF NOT EXISTS idx_airdrops_last_seen ON airdrops (last_seen);
+"""
+
+# Columns added after the first release, as (name, definition)
+MIGRATIONS = [
+    ('content_hash', 'TEXT'),
+    ('active', 'INTEGER NOT NULL DEFAULT 1'),
+    ('dedup_keys', 'TEXT'),
+]
+
+# Fields that change on every scan without the airdrop itself changing
+VOLATILE_FIELDS = {'timestamp', 'first_seen', 'last_seen'}
+
+UPSERT = """
+INSERT INTO airdrops (name, source, status, value, link, data, first_seen, last_seen, content_hash, dedup_keys,
+                      active)
+VALUES (:name, :source, :status, :value, :link, :data, :seen, :seen, :content_hash, :dedup_keys, 1)
+ON CONFLICT (name, source) DO UPDATE SET
+    status = excluded.status,
+    value = excluded.value,
+    link = excluded.link,
+    data = excluded.data,
+    last_seen = excluded.last_seen,
+    content_hash = excluded.content_hash,
+    dedup_keys = excluded.dedup_keys,
+    active = 1
+"""
+
+# A scanned airdrop matched to an existing row by identity; its listing name / source may have moved
+UPDATE = """
+UPDATE airdrops SET
+    name = :name,
+    source = :source,
+    status = :status,
+    value = :value,
+    link = :link,
+    data = :data,
+    last_seen = :seen,
+    content_hash = :content_hash,
+    dedup_keys = :dedup_keys,
+    active = 1
+WHERE id = :id
+"""
+
+
+def content_hash(airdrop):
+    """Stable hash of an airdrop's content, ignoring scan timestamps"""
+    content = {k: v for k, v in airdrop.items() if k not in VOLATILE_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class AirdropStore:
+    """
+    Embedded SQLite airdrop store
+
+    An airdrop is identified by its dedup keys (normalized names and project
+    domains of every listing merged into it), so it keeps its row when the
+    source it was first listed by drops out of a scan. Re-scanning it updates
+    its fields and last_seen; first_seen keeps the first time it was found.
+    """
+
+    def __init__(self, path='airdrops.db'):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        columns = {row['name'] for row in self.conn.execute("PRAGMA table_info(airdrops)")}
+        with self.conn:
+            for name, definition in MIGRATIONS:
+                if name not in columns:
+                    self.conn.execute(f"ALTER TABLE airdrops ADD COLUMN {name} {definition}")
+
+    def _row(self, airdrop, seen):
+        return {
+            'name': airdrop.get('name', ''),
+            'source': airdrop.get('source', ''),
+            'status': airdrop.get('status'),
+            'value': airdrop.get('value'),
+            'link': airdrop.get('link') or airdrop.get('website'),
+            'data': json.dumps(airdrop),
+            'seen': seen,
+            'content_hash': content_hash(airdrop),
+            'dedup_keys': json.dumps(identity_keys(airdrop))
+        }
+
+    def upsert_many(self, airdrops, seen=None):
+        """Insert or update a batch of airdrops in a single transaction"""
+        seen = seen or datetime.now().isoformat()
+        rows = [self._row(airdrop, seen) for airdrop in airdrops]
+
+        with self._lock, self.conn:
+            self.conn.executemany(UPSERT, rows)
+        return len(rows)
+
+    def apply_scan(self, airdrops, sources=None, seen=None):
+        """
+        Persist a scan and diff it against the last persisted snapshot
+
+        Args:
+            airdrops: Everything the scan found
+            sources: Sources that were scanned successfully. An airdrop is
+                     only reported removed when every source that listed it
+                     was scanned, so a source that was down this cycle
+                     doesn't look like it lost everything.
+                     None means every source.
+            seen: Scan timestamp (ISO), defaults to now
+
+        Returns:
+            {'added': [...], 'changed': [...], 'removed': [...]}
+        """
+        seen = seen or datetime.now().isoformat()
+        rows = [self._row(airdrop, seen) for airdrop in airdrops]
+        changes = {'added': [], 'changed': [], 'removed': []}
+
+        with self._lock, self.conn:
+            stored = {
+                row['id']: row
+                for row in self.conn.execute(
+                    "SELECT id, name, source, data, content_hash, active, dedup_keys FROM airdrops"
+                )
+            }
+            by_listing = {(row['name'], row['source']): row_id for row_id, row in stored.items()}
+            by_key = {}
+            for row_id, row in sorted(stored.items(), key=lambda item: -item[1]['active']):
+                keys = row['dedup_keys']
+                keys = json.loads(keys) if keys else identity_keys(json.loads(row['data']))
+                for key in keys:
+                    by_key.setdefault(key, row_id)  # active rows win a shared key
+
+            # Same listing first, then any shared name / domain key. Doing every
+            # exact match before the key matches means renaming a matched row
+            # to its new (name, source) can't collide with another row.
+            matches = [by_listing.get((row['name'], row['source'])) for row in rows]
+            claimed = {row_id for row_id in matches if row_id is not None}
+            for i, row in enumerate(rows):
+                if matches[i] is not None:
+                    continue
+                for key in json.loads(row['dedup_keys']):
+                    row_id = by_key.get(key)
+                    if row_id is not None and row_id not in claimed:
+                        matches[i] = row_id
+                        claimed.add(row_id)
+                        break
+
+            inserts, updates = [], []
+            for airdrop, row, row_id in zip(airdrops, rows, matches):
+                old = stored.get(row_id)
+                if old is None or not old['active']:
+                    changes['added'].append(airdrop)
+                elif old['content_hash'] != row['content_hash']:
+                    changes['changed'].append(airdrop)
+                if old is None:
+                    inserts.append(row)
+                else:
+                    updates.append(dict(row, id=row_id))
+
+            self.conn.executemany(UPDATE, updates)
+            self.conn.executemany(UPSERT, inserts)
+
+            # Removed only when every source that listed it was scanned and none still does
+            removed = []
+            for row_id, row in stored.items():
+                if not row['active'] or row_id in claimed:
+                    continue
+                data = json.loads(row['data'])
+                listed_by = {listing.get('source') for listing in data.get('sources') or []} or {row['source']}
+                if sources is None or listed_by <= set(sources):
+                    removed.append((row_id, data))
+            self.conn.executemany(
+                "UPDATE airdrops SET active = 0 WHERE id = ?", [(row_id,) for row_id, _ in removed]
+            )
+            changes['removed'] = [data for _, data in removed]
+
+        return changes
+
+    def _to_dict(self, row):
+        airdrop = json.loads(row['data'])
+        airdrop['first_seen'] = row['first_seen']
+        airdrop['last_seen'] = row['last_seen']
+        return airdrop
+
+    def query(self, status=None, source=None, since=None, limit=50):
+        """
+        Airdrops matching the filters, most recently seen first
+
+        Args:
+            status: Exact status (e.g. 'Confirmed')
+            source: Exact source name (e.g. 'CryptoRank')
+            since: Only airdrops seen at or after this ISO timestamp
+            limit: Max rows
+        """
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(source)
+        if since is not None:
+            clauses.append("last_seen >= ?")
+            params.append(since)
+
+        sql = "SELECT data, first_seen, last_seen FROM airdrops"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY last_seen DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def get(self, name):
+        """All records for an airdrop name"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT data, first_seen, last_seen FROM airdrops WHERE name = ?", (name,)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def count(self):
+        """Number of airdrops ever seen"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM airdrops").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,64 @@
+"""
+Parse Benchmark - per-page parse time of each HTML parser backend
+Runs the built-in source card specs against saved fixture pages.
+
+Usage:
+    python benchmarks/bench_parse.py [--repeat 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from html_parser import available_backends, get_backend  # noqa: E402
+from sources import CRYPTORANK_CARDS, AIRDROPS_IO_CARDS  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+FIXTURES = [
+    ('cryptorank.html', CRYPTORANK_CARDS),
+    ('airdrops_io.html', AIRDROPS_IO_CARDS),
+]
+
+
+def time_parse(backend, html, spec, limit, repeat):
+    """Best-of-`repeat` wall time (ms) for one page"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cards = list(backend.iter_cards(html, spec, limit))
+        best = min(best, time.perf_counter() - started)
+    return best * 1000, len(cards)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML parser backends")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    backends = available_backends()
+    print(f"Backends installed: {', '.join(backends)}\n")
+    print(f"{'fixture':<18} {'limit':>6} {'backend':<12} {'ms/page':>9} {'cards':>6} {'speedup':>8}")
+    print("-" * 64)
+
+    for filename, spec in FIXTURES:
+        with open(os.path.join(FIXTURES_DIR, filename), 'rb') as f:
+            html = f.read()
+
+        for limit in (10, None):
+            timings = {}
+            for name in backends:
+                timings[name] = time_parse(get_backend(name), html, spec, limit, args.repeat)
+
+            baseline = timings.get('bs4', (None,))[0]
+            for name, (ms, cards) in timings.items():
+                speedup = f"{baseline / ms:.1f}x" if baseline else "-"
+                print(f"{filename:<18} {str(limit or 'all'):>6} {name:<12} {ms:>9.2f} {cards:>6} {speedup:>8}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Scanner Benchmark - replay recorded pages through the scan pipeline
+Serves benchmarks/fixtures from a local HTTP server and times each stage
+per source: fetch, parse, streaming parse, legitimacy filter and dedup.
+Results are written as JSON so runs can be compared across commits.
+
+Usage:
+    python benchmarks/bench_scanner.py [--repeat 5] [--limit N] [--output results.json]
+    python benchmarks/bench_scanner.py --compare benchmarks/results/<old>.json
+"""
+
+import argparse
+import functools
+import http.server
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import http_client  # noqa: E402
+from dedup import merge_airdrops  # noqa: E402
+from html_parser import StreamingCardParser, get_backend  # noqa: E402
+from scam_detector import ScamDetector  # noqa: E402
+from sources import SOURCE_REGISTRY  # noqa: E402
+
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+# Recorded page for each registered source
+FIXTURES = {
+    'CryptoRank': 'cryptorank.html',
+    'Airdrops.io': 'airdrops_io.html',
+}
+
+STAGES = ['fetch', 'parse', 'stream_parse', 'legitimacy', 'dedup']
+
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def start_fixture_server():
+    """Serve the fixtures directory on a free localhost port"""
+    handler = functools.partial(QuietHandler, directory=FIXTURES_DIR)
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def stream_parse(source, body, limit, chunk_size=65536):
+    parser = StreamingCardParser(source.cards, limit)
+    cards = []
+    for i in range(0, len(body), chunk_size):
+        cards.extend(parser.feed(body[i:i + chunk_size]))
+        if parser.done:
+            break
+    cards.extend(parser.close())
+    return source.build_all(cards)
+
+
+def run_pipeline(client, url, source, detector, limit):
+    """One pass through every stage; returns ({stage: seconds}, listings parsed)"""
+    timings = {}
+
+    timings['fetch'], response = timed(client.get, url)
+    body = response.content
+
+    def parse(html):
+        return source.build_all(get_backend().iter_cards(html, source.cards, limit))
+
+    timings['parse'], airdrops = timed(parse, body)
+    timings['stream_parse'], _ = timed(stream_parse, source, body, limit)
+    timings['legitimacy'], legitimate = timed(
+        lambda items: [a for a in items if detector.is_legitimate(a)], airdrops
+    )
+    timings['dedup'], _ = timed(merge_airdrops, legitimate)
+
+    return timings, len(airdrops)
+
+
+def bench_source(client, base_url, name, detector, limit, repeat):
+    source = SOURCE_REGISTRY[name]
+    url = f"{base_url}/{FIXTURES[name]}"
+
+    runs = [run_pipeline(client, url, source, detector, limit) for _ in range(repeat)]
+    listings = runs[0][1]
+    stage_ms = {
+        stage: round(statistics.median(timings[stage] for timings, _ in runs) * 1000, 3)
+        for stage in STAGES
+    }
+    pipeline_ms = stage_ms['fetch'] + stage_ms['parse'] + stage_ms['legitimacy'] + stage_ms['dedup']
+
+    # Separate pass for memory - tracemalloc slows everything down
+    tracemalloc.start()
+    run_pipeline(client, url, source, detector, limit)
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'listings': listings,
+        'stages_ms': stage_ms,
+        'pipeline_ms': round(pipeline_ms, 3),
+        'listings_per_sec': round(listings / (pipeline_ms / 1000), 1) if pipeline_ms else None,
+        'peak_traced_mb': round(peak_bytes / 1e6, 3),
+    }
+
+
+def print_report(report, baseline=None):
+    print(f"\nScanner benchmark @ {report['commit']} (parser: {report['parser_backend']}, "
+          f"repeat: {report['repeat']}, limit: {report['limit'] or 'all'})\n")
+    header = f"{'source':<14}" + ''.join(f"{stage:>14}" for stage in STAGES) + f"{'listings/s':>12}{'peak MB':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for name, result in report['sources'].items():
+        row = f"{name:<14}" + ''.join(f"{result['stages_ms'][stage]:>12.2f}ms" for stage in STAGES)
+        row += f"{result['listings_per_sec'] or 0:>12.0f}{result['peak_traced_mb']:>10.2f}"
+        print(row)
+
+        old = (baseline or {}).get('sources', {}).get(name)
+        if old:
+            deltas = []
+            for stage in STAGES:
+                before, after = old['stages_ms'].get(stage), result['stages_ms'][stage]
+                deltas.append(f"{(after - before) / before * 100:>+13.1f}%" if before else f"{'-':>14}")
+            print(f"{'  vs ' + baseline['commit']:<14}" + ''.join(deltas))
+
+    print(f"\nPeak RSS: {report['max_rss_mb']:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scanner against recorded pages")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--limit', type=int, default=None,
+                        help="Cards per page (default: every card, for throughput)")
+    parser.add_argument('--output', help="JSON results path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', help="Earlier JSON results to diff against")
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server()
+    detector = ScamDetector()
+    commit = git_commit()
+
+    try:
+        client = http_client.get_client()
+        sources = {
+            name: bench_source(client, base_url, name, detector, args.limit, args.repeat)
+            for name in FIXTURES
+        }
+    finally:
+        server.shutdown()
+
+    report = {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'parser_backend': get_backend().name,
+        'repeat': args.repeat,
+        'limit': args.limit,
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'sources': sources,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
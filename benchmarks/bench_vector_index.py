@@ -0,0 +1,99 @@
+"""
+Vector Index Benchmark - recall@k and latency of IVF search vs exact search
+Builds a synthetic clustered corpus (embeddings of related chunks bunch
+together, like real ones), trains an IVF collection on it and sweeps
+nprobe. Pick the smallest nprobe whose recall is good enough.
+
+Usage:
+    python benchmarks/bench_vector_index.py [--docs 100000] [--dim 256] [--queries 200]
+                                            [--k 10] [--nlist N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from vector_index import IVFCollection, VectorCollection  # noqa: E402
+
+NPROBES = (1, 2, 4, 8, 16, 32, 64)
+
+
+def clustered_vectors(count, dim, topics, rng, spread=0.35):
+    """`count` vectors scattered around `topics` random directions"""
+    centers = rng.standard_normal((topics, dim)).astype(np.float32)
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+    labels = rng.integers(topics, size=count)
+    noise = rng.standard_normal((count, dim)).astype(np.float32) * (spread / np.sqrt(dim))
+    return centers[labels] + noise
+
+
+def time_queries(search, queries):
+    """(results per query, mean ms per query)"""
+    started = time.perf_counter()
+    results = [search(query) for query in queries]
+    return results, (time.perf_counter() - started) * 1000 / len(queries)
+
+
+def recall_at_k(results, truth):
+    """Fraction of the exact top-k found, averaged over queries"""
+    hits = sum(len({doc_id for doc_id, _ in got} & expected) for got, expected in zip(results, truth))
+    return hits / sum(len(expected) for expected in truth)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark IVF recall@k against exact vector search")
+    parser.add_argument('--docs', type=int, default=100_000)
+    parser.add_argument('--dim', type=int, default=256)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--nlist', type=int, default=None, help="clusters (default 4 * sqrt(docs))")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    topics = max(10, args.docs // 500)
+    vectors = clustered_vectors(args.docs + args.queries, args.dim, topics, rng)
+    corpus, queries = vectors[:args.docs], vectors[args.docs:]
+    texts = [''] * args.docs
+
+    exact = VectorCollection(args.dim)
+    exact.add(corpus, texts)
+
+    ivf = IVFCollection(args.dim, nlist=args.nlist, train_size=args.docs + 1)
+    # Train on the first half, then insert the rest incrementally
+    half = args.docs // 2
+    ivf.add(corpus[:half], texts[:half])
+    started = time.perf_counter()
+    ivf.train()
+    train_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    ivf.add(corpus[half:], texts[half:])
+    insert_seconds = time.perf_counter() - started
+
+    print(f"{args.docs} docs x {args.dim} dims, {args.queries} queries, k={args.k}")
+    print(f"IVF: nlist={ivf.nlist}, trained on {half} docs in {train_seconds:.2f}s, "
+          f"{args.docs - half} incremental inserts in {insert_seconds:.2f}s\n")
+
+    truth_results, exact_ms = time_queries(lambda q: exact.search(q, args.k), queries)
+    truth = [{doc_id for doc_id, _ in result} for result in truth_results]
+
+    print(f"{'index':<8} {'nprobe':>7} {'recall@k':>9} {'ms/query':>9} {'scanned':>8} {'speedup':>8}")
+    print("-" * 54)
+    print(f"{'exact':<8} {'-':>7} {1.0:>9.3f} {exact_ms:>9.3f} {'100%':>8} {'1.0x':>8}")
+    for nprobe in NPROBES:
+        if nprobe > ivf.nlist:
+            break
+        results, ms = time_queries(lambda q: ivf.search(q, args.k, nprobe=nprobe), queries)
+        list_sizes = np.array([len(rows) for rows in ivf.lists])
+        scanned = np.sort(list_sizes)[::-1][:nprobe].sum() / args.docs  # upper bound
+        print(f"{'ivf':<8} {nprobe:>7} {recall_at_k(results, truth):>9.3f} {ms:>9.3f} "
+              f"{f'<{scanned:.0%}':>8} {f'{exact_ms / ms:.1f}x':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,20 @@
 # Complete Telegram Bot with ALL Features
 # Production-ready, error-free deployment
 
+import startup_profiler
+startup_profiler.install()  # no-op unless STARTUP_PROFILE is set
+
 import os
+import asyncio
 import logging
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+from executors import run_io, shutdown as shutdown_executors
+from integrations import IntegrationRegistry
+from message_queue import MessageQueue
+import templates
+from scan_daemon import ScanDaemon
+from webhook_server import run_application
 
 # Setup logging
 logging.basicConfig(
@@ -13,71 +23,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Import all integrations (with error handling)
-try:
-    from crewai_integration import execute_airdrop_scan, get_crewai_info
-    CREWAI_AVAILABLE = True
-except Exception as e:
-    logger.warning(f"CrewAI not available: {e}")
-    CREWAI_AVAILABLE = False
-
-try:
-    from gpt_researcher_integration import research_new_airdrops, research_hotstuff_detailed, get_researcher_info
-    RESEARCHER_AVAILABLE = True
-except Exception as e:
-    logger.warning(f"GPT Researcher not available: {e}")
-    RESEARCHER_AVAILABLE = False
-
-try:
-    from autogen_integration import run_airdrop_hunt, get_autogen_info
-    AUTOGEN_AVAILABLE = True
-except Exception as e:
-    logger.warning(f"AutoGen not available: {e}")
-    AUTOGEN_AVAILABLE = False
-
-try:
-    from langgraph_integration import run_airdrop_workflow, get_langgraph_info
-    LANGGRAPH_AVAILABLE = True
-except Exception as e:
-    logger.warning(f"LangGraph not available: {e}")
-    LANGGRAPH_AVAILABLE = False
-
-try:
-    from advanced_ai_features import AdvancedAIFeatures
-    ADVANCED_AI_AVAILABLE = True
-except Exception as e:
-    logger.warning(f"Advanced AI not available: {e}")
-    ADVANCED_AI_AVAILABLE = False
-
-try:
-    from web3_advanced_features import Web3AdvancedFeatures
-    WEB3_AVAILABLE = True
-except Exception as e:
-    logger.warning(f"Web3 features not available: {e}")
-    WEB3_AVAILABLE = False
-
-try:
-    from latest_free_agents import LatestFreeAgents
-    LATEST_AGENTS_AVAILABLE = True
-except Exception as e:
-    logger.warning(f"Latest agents not available: {e}")
-    LATEST_AGENTS_AVAILABLE = False
-
-try:
-    from hotstuff_tracker import HotStuffTracker
-    HOTSTUFF_AVAILABLE = True
-except Exception as e:
-    logger.warning(f"HotStuff tracker not available: {e}")
-    HOTSTUFF_AVAILABLE = False
+# Optional integrations - probed now, imported by the first command that needs one
+integrations = IntegrationRegistry()
+integrations.register('crewai', 'crewai_integration', 'CrewAI')
+integrations.register('researcher', 'gpt_researcher_integration', 'GPT Researcher')
+integrations.register('autogen', 'autogen_integration', 'AutoGen')
+integrations.register('langgraph', 'langgraph_integration', 'LangGraph')
+integrations.register('advanced_ai', 'advanced_ai_features', 'Advanced AI')
+integrations.register('web3', 'web3_advanced_features', 'Web3 features')
+integrations.register('latest_agents', 'latest_free_agents', 'Latest agents')
+integrations.register('hotstuff', 'hotstuff_tracker', 'HotStuff tracker')
 
 # Bot token from environment variable
 BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN', '8482827002:AAGIFEBwpQlOYwxuKebcTPQKAl-y2ZbGJZY')
 
-# ==================== Command Handlers ====================
+# Slow pipelines run in the background; /scan replies from the latest result
+SCAN_REFRESH_SECONDS = int(os.getenv('SCAN_REFRESH_SECONDS', '900'))
+scan_daemon = ScanDaemon(
+    {'crew_scan': lambda: integrations.call('crewai', 'execute_airdrop_scan')}
+    if integrations.available('crewai') else {},
+    interval=SCAN_REFRESH_SECONDS
+)
 
-async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Start command - Welcome message"""
-    welcome_message = """
+# Every reply goes through one paced outbox (Telegram flood limits)
+outbox = MessageQueue()
+
+# Seconds a command may spend on blocking work (run off the event loop) before giving up
+COMMAND_TIMEOUTS = {
+    'hotstuff': 15,
+    'research': 90,
+    'crew': 120
+}
+
+# Updates handled at once, so a slow /research or /crew doesn't hold up other chats
+CONCURRENT_UPDATES = int(os.getenv('CONCURRENT_UPDATES', '64'))
+
+# ==================== Templates ====================
+
+# Static replies are compiled and rendered once, then served from memory
+templates.register('main_welcome', """
 🚀 **Welcome to Ultimate Crypto Airdrop Bot!**
 
 **World's Most Advanced FREE AI Bot**
@@ -97,12 +81,9 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 /features - See all features
 
 **Let's find some airdrops!** 🎁
-    """
-    await update.message.reply_text(welcome_message, parse_mode='Markdown')
+""")
 
-async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Help command - Show all commands"""
-    help_text = """
+templates.register('main_help', """
 📚 **Bot Commands:**
 
 **🎁 Airdrop Hunting:**
@@ -138,17 +119,73 @@ async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 /features - All features
 /status - Bot status
 /help - This message
-    """
-    await update.message.reply_text(help_text, parse_mode='Markdown')
+""")
+
+templates.register('main_features', """
+🚀 **All Features:**
+
+**🤖 AI Agents (17):**
+✅ CrewAI - Multi-agent teams
+✅ AutoGen - Conversations
+✅ LangGraph - Workflows
+✅ GPT Researcher - Research
+✅ n8n - Automation
+✅ Langflow - Visual builder
+✅ DeepSeek-V3 - GPT-4 level
+✅ Ollama - Local models
+✅ Gemini 2.5 Flash - FREE API
+✅ Groq - Ultra-fast
+✅ Cerebras - Fastest
+✅ OpenRouter - Multi-model
+✅ MAI-UI - GUI automation
+✅ Dify - App builder
+✅ OpenHands - Coding
+✅ AgentGPT - Browser
+✅ Pathway - Real-time
+
+**🧠 Advanced AI (7):**
+✅ RAG - Vector search
+✅ Multimodal - Vision/audio
+✅ Function calling
+✅ Streaming
+✅ Code interpreter
+✅ Advanced reasoning
+✅ Memory
+
+**⛓️ Web3 (8):**
+✅ Smart contracts
+✅ On-chain analytics
+✅ DeFi integration
+✅ Gas optimization
+✅ MEV protection
+✅ Cross-chain bridge
+✅ NFT analysis
+✅ Risk assessment
+
+**Total:** 32+ features
+**Cost:** $0/month
+**Performance:** Enterprise-grade
+""")
+
+# ==================== Command Handlers ====================
+
+async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Start command - Welcome message"""
+    welcome_message = templates.render('main_welcome')
+    await outbox.reply(update, welcome_message, parse_mode='Markdown')
+
+async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Help command - Show all commands"""
+    help_text = templates.render('main_help')
+    await outbox.reply(update, help_text, parse_mode='Markdown')
 
 async def scan_airdrops(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Scan for new airdrops"""
-    await update.message.reply_text("🔍 Scanning for airdrops... Please wait...")
-    
     try:
-        if CREWAI_AVAILABLE:
-            result = execute_airdrop_scan()
-            await update.message.reply_text(result, parse_mode='Markdown')
+        # Precomputed by scan_daemon; the fallback covers startup and CrewAI being unavailable
+        result = scan_daemon.snapshot.get('crew_scan')
+        if result:
+            await outbox.reply(update, result, parse_mode='Markdown')
         else:
             # Fallback response
             fallback = """
@@ -178,20 +215,21 @@ async def scan_airdrops(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 Use /claim to get detailed guides!
             """
-            await update.message.reply_text(fallback, parse_mode='Markdown')
+            await outbox.reply(update, fallback, parse_mode='Markdown')
     except Exception as e:
         logger.error(f"Error in scan_airdrops: {e}")
-        await update.message.reply_text("❌ Error scanning airdrops. Please try again.")
+        await outbox.reply(update, "❌ Error scanning airdrops. Please try again.")
 
 async def hotstuff_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Get HotStuff L1 status"""
-    await update.message.reply_text("🔥 Checking HotStuff status...")
+    await outbox.reply(update, "🔥 Checking HotStuff status...")
     
     try:
-        if HOTSTUFF_AVAILABLE:
-            tracker = HotStuffTracker()
-            status = tracker.get_status()
-            await update.message.reply_text(status, parse_mode='Markdown')
+        if integrations.available('hotstuff'):
+            # The module's shared tracker caches the testnet status check
+            status = await run_io(integrations.call, 'hotstuff', 'get_hotstuff_notification',
+                                  timeout=COMMAND_TIMEOUTS['hotstuff'])
+            await outbox.reply(update, status, parse_mode='Markdown')
         else:
             # Fallback response
             fallback = """
@@ -212,19 +250,23 @@ async def hotstuff_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
 **Action:** Start trading on testnet!
 **Link:** https://hotstuff.trade
             """
-            await update.message.reply_text(fallback, parse_mode='Markdown')
+            await outbox.reply(update, fallback, parse_mode='Markdown')
+    except asyncio.TimeoutError:
+        logger.warning("hotstuff_status timed out")
+        await outbox.reply(update, "⏱️ HotStuff is slow to respond. Please try again later.")
     except Exception as e:
         logger.error(f"Error in hotstuff_status: {e}")
-        await update.message.reply_text("❌ Error checking HotStuff. Please try again.")
+        await outbox.reply(update, "❌ Error checking HotStuff. Please try again.")
 
 async def research_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Research airdrops"""
-    await update.message.reply_text("🔬 Researching airdrops...")
+    await outbox.reply(update, "🔬 Researching airdrops...")
     
     try:
-        if RESEARCHER_AVAILABLE:
-            result = research_new_airdrops()
-            await update.message.reply_text(result, parse_mode='Markdown')
+        if integrations.available('researcher'):
+            result = await run_io(integrations.call, 'researcher', 'research_new_airdrops',
+                                  timeout=COMMAND_TIMEOUTS['research'])
+            await outbox.reply(update, result, parse_mode='Markdown')
         else:
             fallback = """
 🔬 **Research Report:**
@@ -254,19 +296,23 @@ async def research_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 **Recommendation:** Focus on #1 and #3
             """
-            await update.message.reply_text(fallback, parse_mode='Markdown')
+            await outbox.reply(update, fallback, parse_mode='Markdown')
+    except asyncio.TimeoutError:
+        logger.warning("research_command timed out")
+        await outbox.reply(update, "⏱️ Research is taking too long. Please try again later.")
     except Exception as e:
         logger.error(f"Error in research: {e}")
-        await update.message.reply_text("❌ Error researching. Please try again.")
+        await outbox.reply(update, "❌ Error researching. Please try again.")
 
 async def crew_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Run CrewAI agents"""
-    await update.message.reply_text("🤖 Running CrewAI agents...")
+    await outbox.reply(update, "🤖 Running CrewAI agents...")
     
     try:
-        if CREWAI_AVAILABLE:
-            result = execute_airdrop_scan()
-            await update.message.reply_text(result, parse_mode='Markdown')
+        if integrations.available('crewai'):
+            result = await run_io(integrations.call, 'crewai', 'execute_airdrop_scan',
+                                  timeout=COMMAND_TIMEOUTS['crew'])
+            await outbox.reply(update, result, parse_mode='Markdown')
         else:
             info = """
 🤖 **CrewAI Multi-Agent System**
@@ -283,59 +329,18 @@ async def crew_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 Use /scan to run the crew!
             """
-            await update.message.reply_text(info, parse_mode='Markdown')
+            await outbox.reply(update, info, parse_mode='Markdown')
+    except asyncio.TimeoutError:
+        logger.warning("crew_command timed out")
+        await outbox.reply(update, "⏱️ The crew is taking too long. Please try again later.")
     except Exception as e:
         logger.error(f"Error in crew: {e}")
-        await update.message.reply_text("❌ Error running crew. Please try again.")
+        await outbox.reply(update, "❌ Error running crew. Please try again.")
 
 async def features_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show all features"""
-    features = """
-🚀 **All Features:**
-
-**🤖 AI Agents (17):**
-✅ CrewAI - Multi-agent teams
-✅ AutoGen - Conversations
-✅ LangGraph - Workflows
-✅ GPT Researcher - Research
-✅ n8n - Automation
-✅ Langflow - Visual builder
-✅ DeepSeek-V3 - GPT-4 level
-✅ Ollama - Local models
-✅ Gemini 2.5 Flash - FREE API
-✅ Groq - Ultra-fast
-✅ Cerebras - Fastest
-✅ OpenRouter - Multi-model
-✅ MAI-UI - GUI automation
-✅ Dify - App builder
-✅ OpenHands - Coding
-✅ AgentGPT - Browser
-✅ Pathway - Real-time
-
-**🧠 Advanced AI (7):**
-✅ RAG - Vector search
-✅ Multimodal - Vision/audio
-✅ Function calling
-✅ Streaming
-✅ Code interpreter
-✅ Advanced reasoning
-✅ Memory
-
-**⛓️ Web3 (8):**
-✅ Smart contracts
-✅ On-chain analytics
-✅ DeFi integration
-✅ Gas optimization
-✅ MEV protection
-✅ Cross-chain bridge
-✅ NFT analysis
-✅ Risk assessment
-
-**Total:** 32+ features
-**Cost:** $0/month
-**Performance:** Enterprise-grade
-    """
-    await update.message.reply_text(features, parse_mode='Markdown')
+    features = templates.render('main_features')
+    await outbox.reply(update, features, parse_mode='Markdown')
 
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Bot status"""
@@ -343,14 +348,14 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 📊 **Bot Status:**
 
 **Core:** ✅ Running
-**CrewAI:** {'✅' if CREWAI_AVAILABLE else '⏳'} {'Active' if CREWAI_AVAILABLE else 'Loading'}
-**GPT Researcher:** {'✅' if RESEARCHER_AVAILABLE else '⏳'} {'Active' if RESEARCHER_AVAILABLE else 'Loading'}
-**AutoGen:** {'✅' if AUTOGEN_AVAILABLE else '⏳'} {'Active' if AUTOGEN_AVAILABLE else 'Loading'}
-**LangGraph:** {'✅' if LANGGRAPH_AVAILABLE else '⏳'} {'Active' if LANGGRAPH_AVAILABLE else 'Loading'}
-**Advanced AI:** {'✅' if ADVANCED_AI_AVAILABLE else '⏳'} {'Active' if ADVANCED_AI_AVAILABLE else 'Loading'}
-**Web3:** {'✅' if WEB3_AVAILABLE else '⏳'} {'Active' if WEB3_AVAILABLE else 'Loading'}
-**Latest Agents:** {'✅' if LATEST_AGENTS_AVAILABLE else '⏳'} {'Active' if LATEST_AGENTS_AVAILABLE else 'Loading'}
-**HotStuff:** {'✅' if HOTSTUFF_AVAILABLE else '⏳'} {'Active' if HOTSTUFF_AVAILABLE else 'Loading'}
+**CrewAI:** {'✅' if integrations.available('crewai') else '⏳'} {'Active' if integrations.available('crewai') else 'Loading'}
+**GPT Researcher:** {'✅' if integrations.available('researcher') else '⏳'} {'Active' if integrations.available('researcher') else 'Loading'}
+**AutoGen:** {'✅' if integrations.available('autogen') else '⏳'} {'Active' if integrations.available('autogen') else 'Loading'}
+**LangGraph:** {'✅' if integrations.available('langgraph') else '⏳'} {'Active' if integrations.available('langgraph') else 'Loading'}
+**Advanced AI:** {'✅' if integrations.available('advanced_ai') else '⏳'} {'Active' if integrations.available('advanced_ai') else 'Loading'}
+**Web3:** {'✅' if integrations.available('web3') else '⏳'} {'Active' if integrations.available('web3') else 'Loading'}
+**Latest Agents:** {'✅' if integrations.available('latest_agents') else '⏳'} {'Active' if integrations.available('latest_agents') else 'Loading'}
+**HotStuff:** {'✅' if integrations.available('hotstuff') else '⏳'} {'Active' if integrations.available('hotstuff') else 'Loading'}
 
 **Uptime:** 100%
 **Response Time:** <100ms
@@ -358,11 +363,11 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 **All systems operational!** 🚀
     """
-    await update.message.reply_text(status, parse_mode='Markdown')
+    await outbox.reply(update, status, parse_mode='Markdown')
 
 async def yield_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Find best yields"""
-    await update.message.reply_text("💰 Finding best yields...")
+    await outbox.reply(update, "💰 Finding best yields...")
     
     yield_info = """
 💰 **Best Yield Opportunities:**
@@ -387,7 +392,7 @@ async def yield_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 **Recommendation:** Start with Aave (safest)
     """
-    await update.message.reply_text(yield_info, parse_mode='Markdown')
+    await outbox.reply(update, yield_info, parse_mode='Markdown')
 
 async def gas_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Gas optimization"""
@@ -411,51 +416,86 @@ async def gas_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 • BSC: $0.20 (97% savings)
 • Arbitrum: $0.50 (93% savings)
     """
-    await update.message.reply_text(gas_info, parse_mode='Markdown')
+    await outbox.reply(update, gas_info, parse_mode='Markdown')
 
 async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle errors"""
     logger.error(f"Update {update} caused error {context.error}")
     
     if update and update.message:
-        await update.message.reply_text(
+        await outbox.reply(update,
             "❌ An error occurred. Please try again or use /help for available commands."
         )
 
+# ==================== Lifecycle ====================
+
+async def post_init(application):
+    """Start background work once the application is up"""
+    with startup_profiler.phase('post_init'):
+        outbox.start(application.bot)
+        scan_daemon.start()
+    startup_profiler.mark('ready')
+    if os.getenv('PRELOAD_INTEGRATIONS') == '1':
+        # Import everything off the event loop once the bot is already answering
+        application.create_task(run_io(preload_integrations))
+
+def preload_integrations():
+    integrations.preload()
+    integrations.log_report()
+
+async def post_shutdown(application):
+    await scan_daemon.stop()
+    await outbox.stop()
+
 # ==================== Main Function ====================
 
 def main():
     """Start the bot"""
+    startup_profiler.mark('main')
     try:
         # Create application
-        application = Application.builder().token(BOT_TOKEN).build()
+        with startup_profiler.phase('build'):
+            application = (
+                Application.builder()
+                .token(BOT_TOKEN)
+                .concurrent_updates(CONCURRENT_UPDATES)
+                .post_init(post_init)
+                .post_shutdown(post_shutdown)
+                .build()
+            )
         
         # Add command handlers
-        application.add_handler(CommandHandler("start", start))
-        application.add_handler(CommandHandler("help", help_command))
-        application.add_handler(CommandHandler("scan", scan_airdrops))
-        application.add_handler(CommandHandler("hotstuff", hotstuff_status))
-        application.add_handler(CommandHandler("research", research_command))
-        application.add_handler(CommandHandler("crew", crew_command))
-        application.add_handler(CommandHandler("features", features_command))
-        application.add_handler(CommandHandler("status", status_command))
-        application.add_handler(CommandHandler("yield", yield_command))
-        application.add_handler(CommandHandler("gas", gas_command))
+        with startup_profiler.phase('handlers'):
+            application.add_handler(CommandHandler("start", start))
+            application.add_handler(CommandHandler("help", help_command))
+            application.add_handler(CommandHandler("scan", scan_airdrops))
+            application.add_handler(CommandHandler("hotstuff", hotstuff_status))
+            application.add_handler(CommandHandler("research", research_command))
+            application.add_handler(CommandHandler("crew", crew_command))
+            application.add_handler(CommandHandler("features", features_command))
+            application.add_handler(CommandHandler("status", status_command))
+            application.add_handler(CommandHandler("yield", yield_command))
+            application.add_handler(CommandHandler("gas", gas_command))
+        
+            # Add error handler
+            application.add_error_handler(error_handler)
         
-        # Add error handler
-        application.add_error_handler(error_handler)
+        startup_profiler.watch_first_update(application)
         
         # Start bot
+        integrations.log_report()
         logger.info("🚀 Bot starting...")
         print("✅ Bot is running! Press Ctrl+C to stop.")
         
-        # Run bot
-        application.run_polling(allowed_updates=Update.ALL_TYPES)
+        # Run bot (webhooks when WEBHOOK_URL is set, long-polling otherwise)
+        run_application(application, allowed_updates=Update.ALL_TYPES)
         
     except Exception as e:
         logger.error(f"Failed to start bot: {e}")
         print(f"❌ Error: {e}")
         print("Please check your TELEGRAM_BOT_TOKEN")
+    finally:
+        shutdown_executors(wait=False)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,110 @@
+"""
+Circuit Breaker - per-source failure isolation and health scoring
+After repeated failures a source is skipped for a while, then probed
+again with a single half-open request before it is trusted again.
+"""
+
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Breaker for one upstream
+
+    Args:
+        name: Source name (for reporting)
+        failure_threshold: Consecutive failures that open the breaker
+        recovery_timeout: Seconds to stay open before a half-open probe
+        slow_threshold: Latency (seconds) above which the health score drops
+        alpha: Weight of the newest sample in the latency / error-rate averages
+    """
+
+    def __init__(self, name, failure_threshold=3, recovery_timeout=60.0, slow_threshold=5.0, alpha=0.3):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.slow_threshold = slow_threshold
+        self.alpha = alpha
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.latency = None  # moving average, seconds
+        self.error_rate = 0.0  # moving average, 0..1
+        self.successes = 0
+        self.failures = 0
+        self.skipped = 0
+
+    def _average(self, current, sample):
+        return sample if current is None else self.alpha * sample + (1 - self.alpha) * current
+
+    def allow_request(self):
+        """Whether the source may be called now (moves OPEN -> HALF_OPEN once it's time to probe)"""
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                self.skipped += 1
+                return False
+            self.state = HALF_OPEN
+        return True
+
+    def record_success(self, latency):
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.latency = self._average(self.latency, latency)
+        self.error_rate = self._average(self.error_rate, 0.0)
+        self.state = CLOSED
+
+    def record_failure(self, latency=None):
+        self.failures += 1
+        self.consecutive_failures += 1
+        if latency is not None:
+            self.latency = self._average(self.latency, latency)
+        self.error_rate = self._average(self.error_rate, 1.0)
+
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def health_score(self):
+        """0 (dead) to 100 (fast and reliable)"""
+        if self.state == OPEN:
+            return 0
+
+        score = 100 * (1 - self.error_rate)
+        if self.latency and self.latency > self.slow_threshold:
+            score *= self.slow_threshold / self.latency
+        if self.state == HALF_OPEN:
+            score = min(score, 50)
+        return round(score)
+
+    def snapshot(self):
+        return {
+            'state': self.state,
+            'health': self.health_score(),
+            'latency_ms': round(self.latency * 1000) if self.latency is not None else None,
+            'error_rate': round(self.error_rate, 3),
+            'successes': self.successes,
+            'failures': self.failures,
+            'skipped': self.skipped,
+        }
+
+
+class BreakerRegistry:
+    """One breaker per source name, created on first use"""
+
+    def __init__(self, **breaker_options):
+        self.breaker_options = breaker_options
+        self.breakers = {}
+
+    def get(self, name):
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker(name, **self.breaker_options)
+        return self.breakers[name]
+
+    def health(self):
+        """{source name: snapshot} for every source seen so far"""
+        return {name: breaker.snapshot() for name, breaker in self.breakers.items()}
@@ -0,0 +1,216 @@
+"""
+Dedup Index - merge near-duplicate airdrops across sources
+"PrismaX", "Prisma X" and "prismax airdrop" end up as one record that
+remembers which sources listed it.
+
+Names are normalized and shingled into character trigrams. MinHash
+signatures are bucketed with LSH, so each new listing is only compared
+with a handful of candidates instead of every record seen so far.
+"""
+
+import random
+import re
+import unicodedata
+import zlib
+from urllib.parse import urlsplit
+
+# Words that don't identify a project
+NAME_STOPWORDS = {'airdrop', 'airdrops', 'official'}
+
+# Hosts that many different projects link to, so a shared one proves nothing.
+# Quest platforms are here too: their projects live under paths (app.galxe.com/quest/...)
+GENERIC_DOMAINS = {
+    'airdrops.io', 'cryptorank.io', 'twitter.com', 'x.com', 't.me', 'discord.gg',
+    'discord.com', 'medium.com', 'github.com', 'linktr.ee', 'youtube.com', 'google.com',
+    'galxe.com', 'zealy.io', 'crew3.xyz', 'taskon.xyz', 'layer3.xyz', 'questn.com', 'gleam.io'
+}
+
+# Hosting platforms that give each project its own subdomain:
+# alpha.gitbook.io and zeta.gitbook.io are different projects
+TENANT_SUFFIXES = {
+    'gitbook.io', 'notion.site', 'vercel.app', 'github.io', 'netlify.app', 'pages.dev',
+    'web.app', 'firebaseapp.com', 'herokuapp.com', 'webflow.io', 'framer.website',
+    'framer.ai', 'carrd.co', 'substack.com', 'mirror.xyz', 'wixsite.com', 'blogspot.com',
+    'super.site', 'notion.so', 'readthedocs.io', 'medium.com'
+}
+
+# Multi-label public suffixes (the common part of the Public Suffix List):
+# foo.co.uk and bar.co.uk are different registrable domains
+PUBLIC_SUFFIXES = {
+    'co.uk', 'org.uk', 'me.uk', 'ac.uk', 'gov.uk', 'ltd.uk', 'plc.uk',
+    'com.au', 'net.au', 'org.au', 'co.nz', 'org.nz', 'co.za', 'org.za',
+    'co.jp', 'ne.jp', 'or.jp', 'co.kr', 'or.kr', 'co.in', 'net.in', 'org.in', 'co.id',
+    'com.cn', 'net.cn', 'org.cn', 'com.hk', 'com.tw', 'com.sg', 'com.my', 'com.ph',
+    'com.vn', 'co.th', 'com.tr', 'com.br', 'com.ar', 'com.mx', 'com.co', 'com.ua',
+    'co.il', 'com.ng', 'com.pk', 'com.sa', 'ae.org', 'eu.org', 'us.org', 'uk.com', 'us.com'
+}
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def normalize_name(name):
+    """'Prisma X Airdrop' -> 'prismax'"""
+    name = unicodedata.normalize('NFKD', name or '').encode('ascii', 'ignore').decode('ascii')
+    words = re.findall(r'[a-z0-9]+', name.lower())
+    return ''.join(word for word in words if word not in NAME_STOPWORDS)
+
+
+def normalize_domain(url):
+    """'https://app.prismax.ai/quests' -> 'prismax.ai' (None if not a project URL)"""
+    if not url or '.' not in url:
+        return None
+    if '//' not in url:
+        url = f'//{url}'
+    host = (urlsplit(url).hostname or '').lower().rstrip('.')
+    labels = host.split('.')
+    if len(labels) < 2:
+        return None
+
+    suffix_labels = 2 if '.'.join(labels[-2:]) in PUBLIC_SUFFIXES else 1
+    if len(labels) <= suffix_labels:
+        return None  # a bare public suffix
+    domain = '.'.join(labels[-suffix_labels - 1:])
+    if domain in TENANT_SUFFIXES:
+        # The tenant subdomain is the project; the platform itself identifies nothing
+        tenant = labels[:-suffix_labels - 1]
+        if tenant and tenant[0] == 'www':
+            tenant = tenant[1:]
+        return f"{tenant[-1]}.{domain}" if tenant else None
+    return None if domain in GENERIC_DOMAINS else domain
+
+
+def identity_keys(airdrop):
+    """
+    Every name / domain key a (merged) airdrop is known by
+
+    A merged record's own name and link come from whichever source listed it
+    first, so the keys of every listing in its 'sources' are included too.
+    """
+    keys = []
+    for listing in [airdrop] + list(airdrop.get('sources') or []):
+        name = normalize_name(listing.get('name', ''))
+        if name:
+            keys.append(f'name:{name}')
+        domain = normalize_domain(listing.get('website') or listing.get('link'))
+        if domain:
+            keys.append(f'domain:{domain}')
+    return list(dict.fromkeys(keys))
+
+
+def trigrams(text):
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class DedupIndex:
+    """
+    Incremental near-duplicate index
+
+    Args:
+        threshold: Trigram Jaccard similarity at which two names are the same project
+        num_perm: MinHash signature length
+        bands: LSH bands (num_perm must divide evenly); more bands = more recall
+    """
+
+    def __init__(self, threshold=0.7, num_perm=32, bands=8):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+
+        rng = random.Random(1)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+        self.records = []  # merged airdrops
+        self._shingles = []  # trigram set per record
+        self._by_key = {}  # normalized name or domain -> record index
+        self._buckets = {}  # (band, band signature) -> [record index]
+        self._hash_cache = {}  # trigram -> its hash under every permutation
+
+    def _shingle_hashes(self, shingle):
+        # The trigram vocabulary is small, so each shingle is hashed once
+        hashes = self._hash_cache.get(shingle)
+        if hashes is None:
+            h = zlib.crc32(shingle.encode('utf-8'))
+            hashes = tuple(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for a, b in self._perms)
+            self._hash_cache[shingle] = hashes
+        return hashes
+
+    def _signature(self, shingles):
+        return [min(column) for column in zip(*(self._shingle_hashes(s) for s in shingles))]
+
+    def _band_keys(self, signature):
+        return [
+            (band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+
+    def _find(self, shingles, band_keys):
+        best, best_score = None, self.threshold
+        for band_key in band_keys:
+            for index in self._buckets.get(band_key, ()):
+                score = jaccard(shingles, self._shingles[index])
+                if score >= best_score:
+                    best, best_score = index, score
+        return best
+
+    def add(self, airdrop):
+        """Add a listing; returns the merged record it now belongs to"""
+        name = normalize_name(airdrop.get('name', ''))
+        domain = normalize_domain(airdrop.get('website') or airdrop.get('link'))
+        keys = [f'name:{name}'] if name else []
+        if domain:
+            keys.append(f'domain:{domain}')
+
+        shingles = trigrams(name)
+        provenance = {
+            'source': airdrop.get('source', ''),
+            'name': airdrop.get('name', ''),
+            'link': airdrop.get('link') or airdrop.get('website')
+        }
+
+        # Exact name / domain match first, MinHash candidates only if that misses
+        index = next((self._by_key[key] for key in keys if key in self._by_key), None)
+        band_keys = []
+        if index is None and name:
+            band_keys = self._band_keys(self._signature(shingles))
+            index = self._find(shingles, band_keys)
+
+        if index is None:
+            record = dict(airdrop)
+            record['sources'] = [provenance]
+            index = len(self.records)
+            self.records.append(record)
+            self._shingles.append(shingles)
+            for band_key in band_keys:
+                self._buckets.setdefault(band_key, []).append(index)
+        else:
+            record = self.records[index]
+            record['sources'].append(provenance)
+            # Keep the first listing's fields, fill in what it was missing
+            for field, value in airdrop.items():
+                if value and not record.get(field):
+                    record[field] = value
+
+        for key in keys:
+            self._by_key.setdefault(key, index)
+        return record
+
+
+def merge_airdrops(airdrops, threshold=0.7):
+    """Merge near-duplicate listings; each result has a 'sources' provenance list"""
+    index = DedupIndex(threshold=threshold)
+    for airdrop in airdrops:
+        index.add(airdrop)
+    return index.records
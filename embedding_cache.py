@@ -0,0 +1,226 @@
+"""
+Embedding Cache - never embed the same text twice
+Two tiers in front of the embedding backend:
+
+1. an in-memory LRU, bounded by bytes rather than entries
+2. a SQLite table that survives restarts and is shared by worker processes
+
+Entries are keyed by SHA-256 of the model ID plus the normalized text, so
+whitespace-only differences share an embedding and switching models never
+serves stale vectors.
+
+    cache = EmbeddingCache('text-embedding-3-small', path='embeddings.db')
+    vectors = cache.embed(texts, backend)   # backend(list of texts) -> (n, dim) array
+    cache.stats()                            # hit rates per tier
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+ENTRY_OVERHEAD = 200  # rough bytes per LRU entry beyond the vector (key, node, array header)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    key BLOB PRIMARY KEY,
+    model TEXT NOT NULL,
+    dimension INTEGER NOT NULL,
+    vector BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """Canonical form used for cache keys: NFKC, whitespace collapsed, trimmed"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+class EmbeddingCache:
+    """
+    Byte-bounded LRU over a persistent SQLite store
+
+    Args:
+        model_id: Embedding model (part of every key)
+        path: SQLite file for the persistent tier; None keeps only the LRU
+        max_bytes: Memory budget for the LRU tier
+    """
+
+    def __init__(self, model_id, path='embeddings.db', max_bytes=DEFAULT_MAX_BYTES):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for the embedding cache (pip install numpy)")
+        self.model_id = model_id
+        self.max_bytes = max_bytes
+        self._lru = OrderedDict()  # key -> read-only float32 vector
+        self.bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.conn = None
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(SCHEMA)
+
+    def key(self, text):
+        return hashlib.sha256(f"{self.model_id}\0{normalize_text(text)}".encode()).digest()
+
+    # ==================== Tiers ====================
+
+    def _remember(self, key, vector):
+        """Put a vector in the LRU, evicting least recently used entries over budget"""
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            return
+        size = vector.nbytes + ENTRY_OVERHEAD
+        if size > self.max_bytes:
+            return
+        self._lru[key] = vector
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, evicted = self._lru.popitem(last=False)
+            self.bytes -= evicted.nbytes + ENTRY_OVERHEAD
+
+    def _load(self, keys):
+        """Vectors for `keys` from SQLite (only the ones stored)"""
+        found = {}
+        if self.conn is None or not keys:
+            return found
+        keys = list(keys)
+        for start in range(0, len(keys), 500):  # stay under SQLite's variable limit
+            chunk = keys[start:start + 500]
+            rows = self.conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE model = ? AND key IN ({','.join('?' * len(chunk))})",
+                [self.model_id] + chunk
+            )
+            for key, blob in rows:
+                vector = np.frombuffer(blob, dtype=np.float32)  # read-only view of the blob
+                found[key] = vector
+        return found
+
+    def _store(self, items):
+        if self.conn is None or not items:
+            return
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dimension, vector, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(key, self.model_id, len(vector), vector.tobytes(), now) for key, vector in items]
+            )
+
+    # ==================== API ====================
+
+    def get_many(self, texts):
+        """
+        Cached vectors for `texts`
+
+        Returns:
+            List with a vector or None (a miss) per text
+        """
+        keys = [self.key(text) for text in texts]
+        results = [None] * len(texts)
+        with self._lock:
+            pending = {}
+            for i, key in enumerate(keys):
+                vector = self._lru.get(key)
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                    self.memory_hits += 1
+                    results[i] = vector
+                else:
+                    pending.setdefault(key, []).append(i)
+
+            found = self._load(pending.keys())
+            for key, positions in pending.items():
+                vector = found.get(key)
+                if vector is None:
+                    self.misses += len(positions)
+                    continue
+                self.disk_hits += len(positions)
+                self._remember(key, vector)
+                for i in positions:
+                    results[i] = vector
+        return results
+
+    def put_many(self, texts, vectors):
+        """Cache embeddings for `texts` in both tiers"""
+        items = []
+        for text, vector in zip(texts, vectors):
+            vector = np.array(vector, dtype=np.float32)
+            vector.flags.writeable = False  # shared by every caller that hits it
+            items.append((self.key(text), vector))
+        with self._lock:
+            for key, vector in items:
+                self._remember(key, vector)
+            self._store(items)
+
+    def embed(self, texts, backend):
+        """
+        Embeddings for `texts`, calling `backend` only for uncached ones
+
+        Args:
+            texts: Texts to embed
+            backend: Callable taking a list of texts and returning (n, dim) vectors
+
+        Returns:
+            (len(texts), dim) float32 array
+        """
+        cached = self.get_many(texts)
+        missing = {}  # normalized text -> first original, so duplicates are embedded once
+        for text, vector in zip(texts, cached):
+            if vector is None:
+                missing.setdefault(normalize_text(text), text)
+
+        if missing:
+            originals = list(missing.values())
+            fresh = np.asarray(backend(originals), dtype=np.float32)
+            self.put_many(originals, fresh)
+            by_text = dict(zip(missing, fresh))
+            cached = [vector if vector is not None else by_text[normalize_text(text)]
+                      for text, vector in zip(texts, cached)]
+
+        if not cached:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack(cached)
+
+    def stats(self):
+        """Hit counts and rates per tier, plus LRU occupancy"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            'lookups': lookups,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else None,
+            'memory_hit_rate': round(self.memory_hits / lookups, 3) if lookups else None,
+            'entries': len(self._lru),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+        }
+
+    def clear_memory(self):
+        """Empty the LRU tier (the persistent tier is kept)"""
+        with self._lock:
+            self._lru.clear()
+            self.bytes = 0
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,160 @@
+"""
+Embedding Pipeline - dynamic micro-batching in front of an embedding backend
+Callers hand in single texts (or lists) from any thread; one worker
+thread coalesces whatever is queued into batches of up to
+`max_batch_size`, waiting at most `max_delay` seconds for a batch to fill.
+While a batch is with the backend the next one keeps filling, so batches
+grow with load and concurrent requests share backend calls.
+
+    batcher = EmbeddingBatcher(backend)   # backend(list of texts) -> (n, dim) array
+    vector = batcher.submit(text).result()
+    vectors = batcher.embed(texts)        # same batches as every other caller
+    vector = await batcher.aembed(text)
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces single-text requests into backend batches
+
+    Args:
+        backend: Callable taking a list of texts, returning one vector per text
+        max_batch_size: Most texts per backend call
+        max_delay: Seconds the first queued text waits for others to join its batch
+    """
+
+    def __init__(self, backend, max_batch_size=64, max_delay=0.005):
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self.wait_seconds = 0.0  # total time items spent queued
+        # The worker only holds a weak reference, so a dropped batcher (and the
+        # backend's owner) can be collected; this then stops the worker
+        weakref.finalize(self, self._queue.put, _STOP)
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=_work, args=(weakref.ref(self), self._queue),
+                                                    name='embedding-batcher', daemon=True)
+                    self._worker.start()
+
+    def submit(self, text):
+        """Queue one text; returns a Future resolving to its vector"""
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((text, future, time.perf_counter()))
+        return future
+
+    def embed(self, texts, timeout=None):
+        """Embed a list of texts (they join the shared batches); returns an (n, dim) array"""
+        futures = [self.submit(text) for text in texts]
+        vectors = [future.result(timeout) for future in futures]
+        return np.stack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
+
+    async def aembed(self, text):
+        """Await one text's vector without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def _collect(self, first):
+        """`first` plus whatever arrives before the batch is full or the deadline passes"""
+        batch = [first]
+        deadline = time.perf_counter() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if item is _STOP:
+                self._queue.put(_STOP)  # finish this batch, stop on the next loop
+                break
+            batch.append(item)
+        return batch
+
+    def _handle(self, first):
+        batch = [
+            (text, future, queued) for text, future, queued in self._collect(first)
+            if future.set_running_or_notify_cancel()
+        ]
+        if batch:
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        started = time.perf_counter()
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        self.wait_seconds += sum(started - queued for _, _, queued in batch)
+
+        try:
+            vectors = self.backend([text for text, _, _ in batch])
+            if len(vectors) != len(batch):
+                raise ValueError(f"Backend returned {len(vectors)} vectors for {len(batch)} texts")
+        except Exception as e:
+            logger.warning(f"Embedding batch of {len(batch)} failed: {e}")
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        for (_, future, _), vector in zip(batch, vectors):
+            future.set_result(vector)
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'avg_batch_size': round(self.items / self.batches, 1) if self.batches else None,
+            'largest_batch': self.largest_batch,
+            'avg_queue_ms': round(self.wait_seconds * 1000 / self.items, 2) if self.items else None,
+            'pending': self._queue.qsize(),
+        }
+
+    def close(self, timeout=None):
+        """Finish queued work and stop the worker"""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(_STOP)
+            self._worker.join(timeout)
+
+
+def _work(batcher_ref, requests):
+    """Worker loop; holds the batcher only while it handles a batch"""
+    while True:
+        first = requests.get()
+        if first is _STOP:
+            return
+        batcher = batcher_ref()
+        if batcher is None:
+            first[1].cancel()  # the batcher was collected with this text queued
+            continue
+        batcher._handle(first)
+        del batcher
@@ -0,0 +1,57 @@
+"""
+Executors - run blocking code without freezing the bot's event loop
+A bounded thread pool for blocking I/O (requests, SDK calls, SQLite),
+awaitable with a timeout.
+
+    from executors import run_io
+    result = await run_io(research_new_airdrops, timeout=90)
+
+A timeout or a cancelled handler drops the job if it hasn't started yet.
+A job that is already running can't be interrupted; its result is discarded.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+IO_WORKERS = int(os.getenv('IO_WORKERS', '8'))
+
+_io_pool = None
+_lock = threading.Lock()
+
+
+def io_pool():
+    """The shared thread pool (created on first use)"""
+    global _io_pool
+    with _lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix='io')
+        return _io_pool
+
+
+async def _run(pool, func, args, kwargs, timeout):
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(pool, functools.partial(func, *args, **kwargs))
+    # wait_for cancels the future on timeout / cancellation, which un-queues a job that hasn't started
+    return await asyncio.wait_for(future, timeout)
+
+
+async def run_io(func, *args, timeout=None, **kwargs):
+    """
+    Await a blocking call on the I/O thread pool
+
+    Raises:
+        asyncio.TimeoutError: If it takes longer than `timeout` seconds
+    """
+    return await _run(io_pool(), func, args, kwargs, timeout)
+
+
+def shutdown(wait=True):
+    """Stop the pool, dropping queued jobs (call once the bot has stopped)"""
+    global _io_pool
+    with _lock:
+        pool, _io_pool = _io_pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
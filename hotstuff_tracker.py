@@ -1,15 +1,54 @@
 # HotStuff.trade Integration Module
 # Tracks HotStuff L1 testnet, trading opportunities, and potential airdrops
 
-import requests
+import http_client
 import json
+import time
+import templates
 from datetime import datetime
 
+templates.register('hotstuff_notification', """
+🔥 **HotStuff L1 - DeFi Trading Platform**
+
+**Status:** {status}
+{status_message}
+
+**Platform Info:**
+• Type: {type}
+• Status: {platform_status}
+
+**Key Features:**
+{features}
+
+**💰 Airdrop Potential:** {potential_score}
+
+**Top Opportunities:**
+{opportunities}
+
+**🎯 Recommended Actions:**
+{actions}
+
+**🔗 Links:**
+• Website: {website}
+• Docs: {docs}
+
+**⏰ Time Commitment:** {time_commitment}
+**⚠️ Risk Level:** {risk_level}
+
+Start participating NOW to maximize potential rewards! 🚀
+""")
+
+# Seconds a testnet status check is reused before hotstuff.trade is pinged again
+STATUS_TTL = 300
+
 class HotStuffTracker:
-    def __init__(self):
+    def __init__(self, status_ttl=STATUS_TTL):
         self.base_url = "https://hotstuff.trade"
         self.api_url = "https://api.hotstuff.trade"  # If available
         self.docs_url = "https://docs.hotstuff.trade"
+        self.status_ttl = status_ttl
+        self._status = None
+        self._status_checked_at = 0.0
         
     def get_platform_info(self):
         """Get HotStuff platform information"""
@@ -31,10 +70,17 @@ class HotStuffTracker:
         return info
     
     def check_testnet_status(self):
-        """Check if testnet is active"""
+        """Check if testnet is active (cached for status_ttl seconds)"""
+        if self._status is not None and time.monotonic() - self._status_checked_at < self.status_ttl:
+            return self._status
+        self._status = self._fetch_testnet_status()
+        self._status_checked_at = time.monotonic()
+        return self._status
+    
+    def _fetch_testnet_status(self):
         try:
             # Try to ping the platform
-            response = requests.get(self.base_url, timeout=10)
+            response = http_client.get(self.base_url, timeout=10)
             if response.status_code == 200:
                 return {
                     "status": "✅ LIVE",
@@ -139,53 +185,34 @@ class HotStuffTracker:
         return features
     
     def format_notification(self):
-        """Format notification message for Telegram"""
-        info = self.get_platform_info()
+        """Format notification message for Telegram (re-rendered only when the status changes)"""
         status = self.check_testnet_status()
-        opportunities = self.get_opportunities()
-        airdrop = self.get_airdrop_potential()
-        
-        message = f"""
-🔥 **HotStuff L1 - DeFi Trading Platform**
-
-**Status:** {status['status']}
-{status['message']}
-
-**Platform Info:**
-• Type: {info['type']}
-• Status: {info['status']}
-
-**Key Features:**
-"""
-        for feature in info['features'][:4]:
-            message += f"✅ {feature}\n"
-        
-        message += f"""
-**💰 Airdrop Potential:** {airdrop['potential_score']}
 
-**Top Opportunities:**
-"""
-        for opp in opportunities[:2]:
-            message += f"\n{opp['title']}\n"
-            message += f"└ {opp['description']}\n"
-        
-        message += f"""
-**🎯 Recommended Actions:**
-"""
-        for action in airdrop['recommended_actions'][:3]:
-            message += f"{action}\n"
-        
-        message += f"""
-**🔗 Links:**
-• Website: {self.base_url}
-• Docs: {self.docs_url}
-
-**⏰ Time Commitment:** {airdrop['time_commitment']}
-**⚠️ Risk Level:** {airdrop['risk_level']}
+        def build():
+            info = self.get_platform_info()
+            airdrop = self.get_airdrop_potential()
+            return {
+                'type': info['type'],
+                'platform_status': info['status'],
+                'features': templates.bullets(info['features'][:4], "✅ {}"),
+                'potential_score': airdrop['potential_score'],
+                'opportunities': "\n".join(
+                    f"\n{opp['title']}\n└ {opp['description']}" for opp in self.get_opportunities()[:2]
+                ),
+                'actions': "\n".join(airdrop['recommended_actions'][:3]),
+                'website': self.base_url,
+                'docs': self.docs_url,
+                'time_commitment': airdrop['time_commitment'],
+                'risk_level': airdrop['risk_level']
+            }
 
-Start participating NOW to maximize potential rewards! 🚀
-"""
-        return message
+        return templates.render(
+            'hotstuff_notification',
+            version=(status['status'], status['message']),
+            build=build,
+            status=status['status'],
+            status_message=status['message']
+        )
 
 # Initialize tracker
 hotstuff = HotStuffTracker()
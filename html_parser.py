@@ -0,0 +1,307 @@
+"""
+HTML Parser - fast card extraction for scan sources
+Backends (fastest first): selectolax, lxml, BeautifulSoup (fallback).
+
+A source describes its listing cards once with a CardSpec. Selectors are
+compiled once per backend and only card subtrees are searched for fields.
+
+Selector syntax is deliberately small: "tag", "tag.class" or ".class".
+Set HTML_PARSER_BACKEND=selectolax|lxml|bs4 to force a backend.
+"""
+
+import os
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from bs4 import BeautifulSoup
+    BS4_AVAILABLE = True
+except ImportError:
+    BS4_AVAILABLE = False
+
+BACKEND_ORDER = ['selectolax', 'lxml', 'bs4']
+DEFAULT_BACKEND = os.getenv('HTML_PARSER_BACKEND')
+
+
+def parse_selector(selector):
+    """Split "tag.class" into (tag, class); either part may be None"""
+    tag, _, class_name = selector.partition('.')
+    return (tag or None, class_name or None)
+
+
+class CardSpec:
+    """
+    How to find listing cards on a page and which fields to read from each
+
+    Args:
+        card: Selector for one listing card, e.g. "div.airdrop-card"
+        fields: Dict of field name -> selector (text content)
+                or (selector, attribute) tuple, e.g. {'link': ('a', 'href')}
+    """
+
+    def __init__(self, card, fields):
+        self.card = parse_selector(card)
+        self.fields = {}
+        for field, selector in fields.items():
+            if isinstance(selector, tuple):
+                selector, attr = selector
+            else:
+                attr = None
+            self.fields[field] = (parse_selector(selector), attr)
+        self._compiled = {}
+
+    def compiled(self, backend):
+        """Selectors compiled for a backend (compiled once, then cached)"""
+        if backend.name not in self._compiled:
+            self._compiled[backend.name] = backend.compile(self)
+        return self._compiled[backend.name]
+
+
+# ==================== Backends ====================
+
+class SelectolaxBackend:
+    name = 'selectolax'
+
+    def _css(self, selector):
+        tag, class_name = selector
+        return (tag or '') + (f'.{class_name}' if class_name else '')
+
+    def compile(self, spec):
+        fields = [(field, self._css(selector), attr) for field, (selector, attr) in spec.fields.items()]
+        return self._css(spec.card), fields
+
+    def iter_cards(self, html, spec, limit=None):
+        card_css, fields = spec.compiled(self)
+        tree = LexborHTMLParser(html)
+
+        for i, card in enumerate(tree.css(card_css)):
+            if limit is not None and i >= limit:
+                break
+            values = {}
+            for field, css, attr in fields:
+                node = card.css_first(css)
+                if node is None:
+                    break
+                value = node.attributes.get(attr) if attr else node.text().strip()
+                if value is None:
+                    break
+                values[field] = value
+            else:
+                yield values
+
+
+class LxmlBackend:
+    name = 'lxml'
+
+    def _xpath(self, selector, axis):
+        tag, class_name = selector
+        xpath = f"{axis}{tag or '*'}"
+        if class_name:
+            xpath += f"[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+        return xpath
+
+    def compile(self, spec):
+        fields = [
+            (field, etree.XPath(self._xpath(selector, './/') + '[1]'), attr)
+            for field, (selector, attr) in spec.fields.items()
+        ]
+        return etree.XPath(self._xpath(spec.card, '//')), fields
+
+    def read_fields(self, card, fields):
+        """Field values of one card element, or None if any field is missing"""
+        values = {}
+        for field, xpath, attr in fields:
+            found = xpath(card)
+            if not found:
+                return None
+            value = found[0].get(attr) if attr else ''.join(found[0].itertext()).strip()
+            if value is None:
+                return None
+            values[field] = value
+        return values
+
+    def iter_cards(self, html, spec, limit=None):
+        card_xpath, fields = spec.compiled(self)
+        tree = lxml.html.fromstring(html)
+
+        for i, card in enumerate(card_xpath(tree)):
+            if limit is not None and i >= limit:
+                break
+            values = self.read_fields(card, fields)
+            if values is not None:
+                yield values
+
+
+class SoupBackend:
+    name = 'bs4'
+
+    def _find_args(self, selector):
+        tag, class_name = selector
+        return ([tag] if tag else []), ({'class_': class_name} if class_name else {})
+
+    def compile(self, spec):
+        fields = [(field, self._find_args(selector), attr) for field, (selector, attr) in spec.fields.items()]
+        return self._find_args(spec.card), fields
+
+    def iter_cards(self, html, spec, limit=None):
+        (card_args, card_kwargs), fields = spec.compiled(self)
+        soup = BeautifulSoup(html, 'html.parser')
+
+        for card in soup.find_all(*card_args, limit=limit, **card_kwargs):
+            values = {}
+            for field, (args, kwargs), attr in fields:
+                node = card.find(*args, **kwargs)
+                if node is None:
+                    break
+                value = node.get(attr) if attr else node.get_text().strip()
+                if value is None:
+                    break
+                values[field] = value
+            else:
+                yield values
+
+
+BACKENDS = {
+    'selectolax': (SelectolaxBackend, SELECTOLAX_AVAILABLE),
+    'lxml': (LxmlBackend, LXML_AVAILABLE),
+    'bs4': (SoupBackend, BS4_AVAILABLE),
+}
+
+_backend_instances = {}
+
+
+def available_backends():
+    """Names of installed backends, fastest first"""
+    return [name for name in BACKEND_ORDER if BACKENDS[name][1]]
+
+
+def get_backend(name=None):
+    """A parser backend by name, or the fastest one installed"""
+    name = name or DEFAULT_BACKEND
+    if name is None:
+        installed = available_backends()
+        if not installed:
+            raise RuntimeError("No HTML parser installed (pip install selectolax, lxml or beautifulsoup4)")
+        name = installed[0]
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {name}")
+
+    backend_class, available = BACKENDS[name]
+    if not available:
+        raise RuntimeError(f"HTML parser backend '{name}' is not installed")
+
+    if name not in _backend_instances:
+        _backend_instances[name] = backend_class()
+    return _backend_instances[name]
+
+
+def extract_cards(html, spec, limit=None, backend=None):
+    """
+    Extract field dicts from the first `limit` cards on a page
+
+    Cards missing any field are skipped (but still count toward the limit).
+    """
+    return list(get_backend(backend).iter_cards(html, spec, limit))
+
+
+# ==================== Streaming ====================
+
+class StreamingCardParser:
+    """
+    Incremental card extractor for pages that arrive in chunks
+
+    Built on lxml's HTMLPullParser: each card is read as soon as its closing
+    tag arrives, then it and everything before it is dropped from the tree,
+    so memory stays flat however many cards the page has. Without lxml the
+    chunks are buffered and parsed in one go on close().
+
+        parser = StreamingCardParser(spec, limit=10)
+        for chunk in chunks:
+            cards.extend(parser.feed(chunk))
+            if parser.done:
+                break
+        cards.extend(parser.close())
+    """
+
+    def __init__(self, spec, limit=None):
+        self.spec = spec
+        self.limit = limit
+        self.seen = 0
+
+        if LXML_AVAILABLE:
+            self._backend = get_backend('lxml')
+            _, self._fields = spec.compiled(self._backend)
+            tag, self._class_name = spec.card
+            self._parser = etree.HTMLPullParser(events=('end',), tag=tag)
+            self._chunks = None
+        else:
+            self._parser = None
+            self._chunks = []
+
+    @property
+    def done(self):
+        """True once `limit` cards have been seen - stop reading the stream"""
+        return self.limit is not None and self.seen >= self.limit
+
+    def _is_card(self, element):
+        if self._class_name is None:
+            return True
+        return self._class_name in (element.get('class') or '').split()
+
+    def _read_cards(self):
+        cards = []
+        for _, element in self._parser.read_events():
+            if self.done or not self._is_card(element):
+                continue
+            self.seen += 1
+
+            values = self._backend.read_fields(element, self._fields)
+            if values is not None:
+                cards.append(values)
+
+            # Free the finished card and every sibling before it
+            element.clear()
+            parent = element.getparent()
+            if parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+        return cards
+
+    def feed(self, chunk):
+        """Feed a chunk of bytes; returns cards completed by this chunk"""
+        if self.done:
+            return []
+        if self._parser is None:
+            self._chunks.append(chunk)
+            return []
+
+        self._parser.feed(chunk)
+        return self._read_cards()
+
+    def close(self):
+        """Finish parsing; returns any remaining cards"""
+        if self._parser is None:
+            html = b''.join(self._chunks)
+            self._chunks = []
+            return extract_cards(html, self.spec, self.limit) if html else []
+
+        if self.done:
+            return []
+        try:
+            self._parser.close()
+        except etree.XMLSyntaxError:
+            # Empty or truncated document - keep whatever was already read
+            pass
+        return self._read_cards()
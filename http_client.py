@@ -0,0 +1,283 @@
+"""
+HTTP Client - one shared, pooled HTTP client for every module
+Keep-alive connection pooling, optional HTTP/2, per-host connection limits
+and jittered exponential retry, so each TLS handshake is paid once per host.
+
+    import http_client
+    response = http_client.get("https://hotstuff.trade", timeout=10)
+
+Async code uses the per-event-loop client:
+
+    client = http_client.get_async_client()
+    response = await client.get(url)
+
+Sync code runs coroutines with http_client.run(), on one long-lived
+background loop whose client (and its open connections) outlives each call.
+"""
+
+import asyncio
+import atexit
+import contextlib
+import importlib.util
+import random
+import threading
+import time
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+
+# HTTP/2 needs the optional h2 package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_PER_HOST_LIMIT = 8
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff ("full jitter")
+
+    Args:
+        retries: Retries after the first attempt
+        backoff: Base delay (seconds); attempt n waits up to backoff * 2**n
+        max_backoff: Cap on a single delay
+        statuses: Response codes worth retrying
+    """
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=8.0, statuses=(429, 500, 502, 503, 504)):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = set(statuses)
+
+    def delay(self, attempt, response=None):
+        """Seconds to wait before retry number `attempt` (0-based)"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+
+    def retries_for(self, method, retry=None):
+        """Retry count for a request; only idempotent methods retry unless retry=True"""
+        if retry is None:
+            retry = method in IDEMPOTENT_METHODS
+        return self.retries if retry else 0
+
+
+def _host(url):
+    return urlsplit(str(url)).netloc
+
+
+def _client_kwargs(timeout, http2):
+    return {
+        'timeout': timeout,
+        'http2': HTTP2_AVAILABLE if http2 is None else http2,
+        'follow_redirects': True,
+        'limits': httpx.Limits(max_connections=100, max_keepalive_connections=20,
+                               keepalive_expiry=30.0),
+    }
+
+
+class HttpClient:
+    """Pooled, retrying sync client (thread-safe)"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, http2=None, per_host_limit=DEFAULT_PER_HOST_LIMIT,
+                 retry=None):
+        self.client = httpx.Client(**_client_kwargs(timeout, http2))
+        self.per_host_limit = per_host_limit
+        self.retry = retry or RetryPolicy()
+        self._host_limits = {}
+        self._lock = threading.Lock()
+
+    def _host_limit(self, url):
+        host = _host(url)
+        with self._lock:
+            if host not in self._host_limits:
+                self._host_limits[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_limits[host]
+
+    def request(self, method, url, retry=None, **kwargs):
+        """
+        Send a request, retrying transport errors and retryable statuses
+
+        Only idempotent methods are retried unless retry=True.
+        """
+        method = method.upper()
+        retries = self.retry.retries_for(method, retry)
+
+        for attempt in range(retries + 1):
+            response = None
+            try:
+                with self._host_limit(url):
+                    response = self.client.request(method, url, **kwargs)
+            except httpx.TransportError:
+                if attempt == retries:
+                    raise
+            else:
+                if response.status_code not in self.retry.statuses or attempt == retries:
+                    return response
+            time.sleep(self.retry.delay(attempt, response))
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def close(self):
+        self.client.close()
+
+
+class AsyncHttpClient:
+    """Pooled, retrying async client (one per event loop)"""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, http2=None, per_host_limit=DEFAULT_PER_HOST_LIMIT,
+                 retry=None):
+        self.client = httpx.AsyncClient(**_client_kwargs(timeout, http2))
+        self.per_host_limit = per_host_limit
+        self.retry = retry or RetryPolicy()
+        self._host_limits = {}
+
+    def _host_limit(self, url):
+        host = _host(url)
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    async def request(self, method, url, retry=None, **kwargs):
+        """Async request(); see HttpClient.request"""
+        async with self.stream(method, url, retry=retry, **kwargs) as response:
+            await response.aread()
+        return response
+
+    @contextlib.asynccontextmanager
+    async def stream(self, method, url, retry=None, **kwargs):
+        """
+        Streamed request; the body is read by the caller
+
+        Retries happen before the response is handed over, so a caller never
+        sees a partially-read response twice.
+        """
+        method = method.upper()
+        retries = self.retry.retries_for(method, retry)
+        request = self.client.build_request(method, url, **kwargs)
+
+        for attempt in range(retries + 1):
+            response = None
+            async with self._host_limit(url):
+                try:
+                    response = await self.client.send(request, stream=True)
+                except httpx.TransportError:
+                    if attempt == retries:
+                        raise
+                else:
+                    if response.status_code not in self.retry.statuses or attempt == retries:
+                        try:
+                            yield response
+                        finally:
+                            await response.aclose()
+                        return
+                    await response.aclose()
+            await asyncio.sleep(self.retry.delay(attempt, response))
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+# ==================== Shared Clients ====================
+
+_client = None
+_client_lock = threading.Lock()
+_async_clients = weakref.WeakKeyDictionary()  # event loop -> AsyncHttpClient
+
+
+def get_client():
+    """The process-wide sync client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+def get_async_client():
+    """The async client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncHttpClient()
+    return client
+
+
+async def close_async_client():
+    """Close the running loop's client (call before the loop shuts down)"""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop():
+    """The shared loop sync callers' coroutines run on, started on first use"""
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='http-client-loop', daemon=True).start()
+                atexit.register(shutdown)
+                _loop = loop
+    return _loop
+
+
+def run(coro):
+    """
+    Run a coroutine from sync code and return its result
+
+    Every call shares one background event loop, so the loop's async client
+    keeps its connections alive between calls (e.g. scan after scan).
+    """
+    loop = _background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("http_client.run() called from the client loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+def shutdown():
+    """Close the background loop's client and stop the loop"""
+    global _loop
+    with _loop_lock:
+        loop, _loop = _loop, None
+    if loop is None or not loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(close_async_client(), loop).result(timeout=5)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+
+
+def get(url, **kwargs):
+    return get_client().get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    return get_client().post(url, **kwargs)
@@ -0,0 +1,124 @@
+"""
+Integrations - optional modules imported on first use
+Availability is probed with importlib.util.find_spec (no import), so a bot
+only pays for an integration when a command actually needs it.
+
+    integrations = IntegrationRegistry()
+    integrations.register('crewai', 'crewai_integration', 'CrewAI')
+
+    if integrations.available('crewai'):
+        result = integrations.call('crewai', 'execute_airdrop_scan')
+"""
+
+import importlib
+import importlib.util
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class Integration:
+    """One optional module: probed cheaply, imported once"""
+
+    def __init__(self, key, module_name, label=None):
+        self.key = key
+        self.module_name = module_name
+        self.label = label or key
+        self.module = None
+        self.error = None
+        self.import_seconds = None
+
+        started = time.perf_counter()
+        try:
+            self.found = importlib.util.find_spec(module_name) is not None
+        except (ImportError, ValueError):
+            self.found = False
+        self.probe_seconds = time.perf_counter() - started
+        self._lock = threading.Lock()
+
+    @property
+    def available(self):
+        """Installed, and didn't fail when it was imported"""
+        return self.found and self.error is None
+
+    @property
+    def loaded(self):
+        return self.module is not None
+
+    def load(self):
+        """Import the module (first call only); raises ImportError if it can't be used"""
+        if self.module is not None:
+            return self.module
+        with self._lock:
+            if self.module is None:
+                if not self.available:
+                    raise ImportError(f"{self.label} not available: {self.error or 'not installed'}")
+                started = time.perf_counter()
+                try:
+                    self.module = importlib.import_module(self.module_name)
+                except Exception as e:
+                    self.error = e
+                    logger.warning(f"{self.label} not available: {e}")
+                    raise ImportError(f"{self.label} not available: {e}") from e
+                finally:
+                    self.import_seconds = time.perf_counter() - started
+                logger.info(f"📦 Loaded {self.label} in {self.import_seconds * 1000:.1f}ms")
+        return self.module
+
+
+class IntegrationRegistry:
+    """Optional integrations by key"""
+
+    def __init__(self):
+        self.integrations = {}
+
+    def register(self, key, module_name, label=None):
+        self.integrations[key] = Integration(key, module_name, label)
+        return self.integrations[key]
+
+    def available(self, key):
+        return self.integrations[key].available
+
+    def load(self, key):
+        return self.integrations[key].load()
+
+    def get(self, key, attr):
+        """An attribute of the integration's module, importing it if needed"""
+        return getattr(self.load(key), attr)
+
+    def call(self, key, attr, *args, **kwargs):
+        """Import if needed, then call module.attr(*args, **kwargs)"""
+        return self.get(key, attr)(*args, **kwargs)
+
+    def preload(self):
+        """Import every available integration now (e.g. in the background after startup)"""
+        for integration in self.integrations.values():
+            if integration.available:
+                try:
+                    integration.load()
+                except ImportError:
+                    pass
+
+    def report(self):
+        """Per-integration availability, probe cost and (once imported) import cost"""
+        return [
+            {
+                'key': integration.key,
+                'module': integration.module_name,
+                'available': integration.available,
+                'loaded': integration.loaded,
+                'probe_ms': round(integration.probe_seconds * 1000, 2),
+                'import_ms': (round(integration.import_seconds * 1000, 1)
+                              if integration.import_seconds is not None else None),
+                'error': str(integration.error) if integration.error else None,
+            }
+            for integration in self.integrations.values()
+        ]
+
+    def log_report(self):
+        for row in self.report():
+            state = 'loaded' if row['loaded'] else 'available' if row['available'] else 'missing'
+            cost = f", import {row['import_ms']}ms" if row['import_ms'] is not None else ""
+            logger.info(f"🔌 {row['key']}: {state} (probe {row['probe_ms']}ms{cost})")
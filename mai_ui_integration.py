@@ -1,7 +1,7 @@
 # MAI-UI Integration Module
 # Integrates MAI-UI GUI agent with Telegram bot
 
-import requests
+import http_client
 import json
 from typing import Dict, List, Optional
 
@@ -27,7 +27,7 @@ class MAIUIIntegration:
     def check_availability(self) -> bool:
         """Check if MAI-UI service is available"""
         try:
-            response = requests.get(f"{self.api_base_url}/models", timeout=5)
+            response = http_client.get(f"{self.api_base_url}/models", timeout=5)
             return response.status_code == 200
         except:
             return False
@@ -63,7 +63,7 @@ class MAIUIIntegration:
             payload["images"] = [screenshot_path]
         
         try:
-            response = requests.post(
+            response = http_client.post(
                 f"{self.api_base_url}/chat/completions",
                 headers=self.headers,
                 json=payload,
@@ -0,0 +1,340 @@
+"""
+Message Queue - paced outbound Telegram messages
+Every message goes through one scheduler that respects Telegram's flood
+limits (about 30 messages/s overall, about 1/s per chat), so a broadcast to
+many subscribers never turns into a storm of 429s.
+
+- Priority lanes: command replies go before alerts, alerts before broadcasts
+- Token buckets: one global, one per chat
+- RetryAfter: the chat is paused for as long as Telegram asks, then retried
+- Coalescing: several queued texts for the same chat go out as one message
+
+    outbox = MessageQueue()
+    outbox.start(application.bot)             # in post_init
+    await outbox.send(chat_id, "Hello!")      # resolves to the sent Message
+    outbox.send(chat_id, alert, priority=PRIORITY_LOW)  # fire and forget
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import statistics
+import time
+from collections import deque
+
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+from rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0  # replies to a command the user is waiting on
+PRIORITY_NORMAL = 1  # alerts
+PRIORITY_LOW = 2  # broadcasts
+LANES = {PRIORITY_HIGH: 'high', PRIORITY_NORMAL: 'normal', PRIORITY_LOW: 'low'}
+
+MAX_MESSAGE_LENGTH = 4096  # Telegram's limit for one text message
+COALESCE_SEPARATOR = '\n\n'
+
+
+def _consume(future):
+    # Fire-and-forget sends: a failure is logged, not raised as "never retrieved"
+    if not future.cancelled():
+        future.exception()
+
+
+def _seconds(retry_after):
+    # int in python-telegram-bot 20.x, timedelta in later releases
+    return retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else float(retry_after)
+
+
+class OutboundMessage:
+    """One queued send_message call"""
+
+    __slots__ = ('chat_id', 'text', 'priority', 'coalesce', 'kwargs', 'future', 'enqueued_at', 'seq',
+                 'attempts')
+
+    def __init__(self, chat_id, text, priority, coalesce, kwargs, future, seq):
+        self.chat_id = chat_id
+        self.text = text
+        self.priority = priority
+        self.coalesce = coalesce
+        self.kwargs = kwargs
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        self.seq = seq
+        self.attempts = 0
+
+    def can_merge(self, other):
+        """Plain text with the same options can share a message (not keyboards)"""
+        return (self.coalesce and other.coalesce and self.kwargs == other.kwargs
+                and 'reply_markup' not in self.kwargs)
+
+
+class ChatState:
+    """Pending messages and send budget for one chat"""
+
+    __slots__ = ('bucket', 'pending', 'entry', 'in_flight')
+
+    def __init__(self, rate, burst):
+        self.bucket = TokenBucket(rate, burst)
+        self.pending = []  # OutboundMessage, sent in (priority, seq) order
+        self.entry = None  # seq of the chat's live entry in the ready / delayed heap
+        self.in_flight = False
+
+
+class MessageQueue:
+    """
+    Outbound message scheduler
+
+    Args:
+        global_rate: Messages per second across all chats
+        chat_rate: Messages per second to one chat
+        chat_burst: Messages a quiet chat may receive back to back
+        max_retries: Retries for network errors (RetryAfter is always honoured)
+    """
+
+    def __init__(self, global_rate=30.0, chat_rate=1.0, chat_burst=3, max_retries=3):
+        # Capacity 1: sends are spread evenly instead of bursting past the limit
+        self.global_bucket = TokenBucket(global_rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.max_retries = max_retries
+
+        self.bot = None
+        self.chats = {}
+        self._ready = []  # (priority, seq, chat_id)
+        self._delayed = []  # (ready_at, priority, seq, chat_id)
+        self._seq = itertools.count()
+        self._wakeup = None
+        self._worker = None
+        self._sends = set()
+        self._pruned_at = time.monotonic()
+
+        self.stats = {'enqueued': 0, 'sent': 0, 'coalesced': 0, 'retry_after': 0, 'retries': 0,
+                      'failed': 0}
+        self.latencies = deque(maxlen=1000)  # enqueue -> delivered, seconds
+
+    # ==================== Public API ====================
+
+    def send(self, chat_id, text, priority=PRIORITY_NORMAL, coalesce=True, **kwargs):
+        """
+        Queue a message
+
+        Args:
+            chat_id: Target chat
+            text: Message text
+            priority: PRIORITY_HIGH / PRIORITY_NORMAL / PRIORITY_LOW
+            coalesce: May be merged with other queued texts for the same chat
+            **kwargs: Passed to bot.send_message (parse_mode, reply_markup, ...)
+
+        Returns:
+            Future resolving to the sent telegram.Message (await it or ignore it)
+        """
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume)
+        message = OutboundMessage(chat_id, text, priority, coalesce, kwargs, future, next(self._seq))
+
+        state = self.chats.get(chat_id)
+        if state is None:
+            state = self.chats[chat_id] = ChatState(self.chat_rate, self.chat_burst)
+        state.pending.append(message)
+        self.stats['enqueued'] += 1
+
+        if not state.in_flight:
+            self._schedule(chat_id, state)
+        return future
+
+    async def reply(self, update, text, priority=PRIORITY_HIGH, **kwargs):
+        """
+        Answer an update in its chat
+
+        Returns as soon as the reply is queued, so a handler never waits out
+        another chat's pacing or a RetryAfter. Await the returned future to
+        wait for delivery.
+        """
+        return self.send(update.effective_chat.id, text, priority=priority, coalesce=False, **kwargs)
+
+    def metrics(self):
+        """Queue depth per lane, counters and delivery latency (ms)"""
+        depth = {lane: 0 for lane in LANES.values()}
+        for state in self.chats.values():
+            for message in state.pending:
+                depth[LANES[message.priority]] += 1
+
+        latencies = sorted(self.latencies)
+        latency = None
+        if latencies:
+            latency = {
+                'p50_ms': round(statistics.median(latencies) * 1000, 1),
+                'p95_ms': round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1),
+                'max_ms': round(latencies[-1] * 1000, 1),
+            }
+
+        return {
+            'depth': sum(depth.values()),
+            'lanes': depth,
+            'chats_waiting': sum(1 for state in self.chats.values() if state.pending),
+            'in_flight': len(self._sends),
+            'latency': latency,
+            **self.stats,
+        }
+
+    def start(self, bot):
+        """Start delivering with `bot` on the running event loop"""
+        self.bot = bot
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        return self._worker
+
+    async def stop(self, drain_timeout=5.0):
+        """Give queued messages up to `drain_timeout` seconds, then drop the rest"""
+        deadline = time.monotonic() + drain_timeout
+        while (self._sends or any(state.pending for state in self.chats.values())) \
+                and time.monotonic() < deadline and self._worker and not self._worker.done():
+            await asyncio.sleep(0.05)
+
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, *self._sends, return_exceptions=True)
+            self._worker = None
+
+        for state in self.chats.values():
+            for message in state.pending:
+                if not message.future.done():
+                    message.future.cancel()
+        self.chats.clear()
+        self._ready.clear()
+        self._delayed.clear()
+
+    # ==================== Scheduling ====================
+
+    def _schedule(self, chat_id, state, ready_at=None):
+        """(Re)queue a chat under the priority of its most urgent pending message"""
+        if not state.pending:
+            return
+        priority = min(message.priority for message in state.pending)
+        seq = next(self._seq)
+        state.entry = seq  # older heap entries for this chat are now stale
+        if ready_at is None:
+            heapq.heappush(self._ready, (priority, seq, chat_id))
+        else:
+            heapq.heappush(self._delayed, (ready_at, priority, seq, chat_id))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _next_chat(self):
+        """Most urgent chat that may be sent to now, or (None, seconds to wait)"""
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, priority, seq, chat_id = heapq.heappop(self._delayed)
+            heapq.heappush(self._ready, (priority, seq, chat_id))
+
+        while self._ready:
+            _, seq, chat_id = heapq.heappop(self._ready)
+            state = self.chats.get(chat_id)
+            if state is None or state.entry != seq or state.in_flight or not state.pending:
+                continue  # stale entry
+
+            wait = state.bucket.wait_time()
+            if wait > 0:
+                # Don't hold up other chats - come back when this one has budget
+                self._schedule(chat_id, state, ready_at=now + wait)
+                continue
+            return chat_id, 0.0
+
+        return None, (self._delayed[0][0] - now) if self._delayed else None
+
+    def _take_batch(self, state):
+        """Pop the next message plus any queued texts it can absorb"""
+        state.pending.sort(key=lambda message: (message.priority, message.seq))
+        batch = [state.pending.pop(0)]
+        length = len(batch[0].text)
+
+        rest = []
+        for message in state.pending:
+            extra = len(COALESCE_SEPARATOR) + len(message.text)
+            if batch[0].can_merge(message) and length + extra <= MAX_MESSAGE_LENGTH:
+                batch.append(message)
+                length += extra
+            else:
+                rest.append(message)
+        state.pending = rest
+        return batch
+
+    async def _run(self):
+        while True:
+            chat_id, wait = self._next_chat()
+            if chat_id is None:
+                self._prune()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self.global_bucket.acquire()
+            state = self.chats[chat_id]
+            state.bucket.reserve()
+            state.in_flight = True  # keeps the chat's messages in order
+            batch = self._take_batch(state)
+            task = asyncio.get_running_loop().create_task(self._deliver(chat_id, state, batch))
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def _deliver(self, chat_id, state, batch):
+        ready_at = None
+        try:
+            text = COALESCE_SEPARATOR.join(message.text for message in batch)
+            sent = await self.bot.send_message(chat_id=chat_id, text=text, **batch[0].kwargs)
+        except RetryAfter as e:
+            delay = _seconds(e.retry_after)
+            self.stats['retry_after'] += 1
+            logger.warning(f"Flood limit for chat {chat_id}, retrying in {delay:.0f}s")
+            state.pending.extend(batch)
+            ready_at = time.monotonic() + delay
+        except (Forbidden, BadRequest) as e:
+            # Blocked the bot, chat gone, malformed text - retrying won't help
+            self._fail(batch, e)
+        except NetworkError as e:
+            for message in batch:
+                message.attempts += 1
+            if batch[0].attempts > self.max_retries:
+                self._fail(batch, e)
+            else:
+                self.stats['retries'] += 1
+                state.pending.extend(batch)
+                ready_at = time.monotonic() + min(30.0, 2 ** batch[0].attempts)
+        except Exception as e:
+            self._fail(batch, e)
+        else:
+            now = time.monotonic()
+            self.stats['sent'] += 1
+            self.stats['coalesced'] += len(batch) - 1
+            for message in batch:
+                self.latencies.append(now - message.enqueued_at)
+                if not message.future.done():
+                    message.future.set_result(sent)
+        finally:
+            state.in_flight = False
+            self._schedule(chat_id, state, ready_at)
+
+    def _prune(self, every=60.0):
+        """Forget idle chats whose bucket has refilled - a fresh state is identical"""
+        now = time.monotonic()
+        if now - self._pruned_at < every:
+            return
+        self._pruned_at = now
+        for chat_id in [chat_id for chat_id, state in self.chats.items()
+                        if not state.pending and not state.in_flight and state.bucket.wait_time(state.bucket.capacity) == 0]:
+            del self.chats[chat_id]
+
+    def _fail(self, batch, error):
+        logger.error(f"Dropping message to chat {batch[0].chat_id}: {error}")
+        self.stats['failed'] += len(batch)
+        for message in batch:
+            if not message.future.done():
+                message.future.set_exception(error)
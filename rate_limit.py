@@ -0,0 +1,76 @@
+"""
+Rate Limiting - token buckets for polite, per-host request budgets
+(also used to pace outbound Telegram messages, see message_queue.py)
+"""
+
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket that refills at `rate` tokens per second up to `capacity`
+
+    Waiters reserve tokens up front (the balance may go negative), so
+    concurrent callers are served in arrival order without a lock and the
+    bucket can be shared across event loops.
+    """
+
+    def __init__(self, rate, capacity=1):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens only if available right now"""
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def wait_time(self, tokens=1):
+        """Seconds until `tokens` are available (0 if they are now); takes nothing"""
+        self._refill()
+        return max(0.0, (tokens - self.tokens) / self.rate)
+
+    def reserve(self, tokens=1):
+        """Reserve tokens and return how long (seconds) the caller must wait"""
+        self._refill()
+        self.tokens -= tokens
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+    async def acquire(self, tokens=1):
+        """Wait until tokens are available"""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HostRateLimiter:
+    """One token bucket per host; the strictest budget declared for a host wins"""
+
+    def __init__(self):
+        self.buckets = {}
+
+    def configure(self, host, rate, burst=1):
+        """Declare a requests-per-second budget for a host"""
+        bucket = self.buckets.get(host)
+        if bucket is None or rate < bucket.rate:
+            self.buckets[host] = TokenBucket(rate, burst)
+
+    async def acquire(self, host):
+        """Wait for the host's budget; hosts without a budget are not limited"""
+        bucket = self.buckets.get(host)
+        if bucket is not None:
+            await bucket.acquire()
@@ -0,0 +1,91 @@
+"""
+Response Cache - on-disk HTTP cache for conditional scanner requests
+Stores ETag / Last-Modified, the raw body and the parsed airdrops per URL,
+so an unchanged page (HTTP 304) costs one round-trip and zero parsing.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+
+class ResponseCache:
+    """
+    URL-keyed response cache
+
+    Each URL gets two files in cache_dir:
+        <sha256>.json - url, etag, last_modified, fetched_at, parsed airdrops
+        <sha256>.body - raw response body
+    """
+
+    def __init__(self, cache_dir='.scan_cache'):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url, ext):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.{ext}")
+
+    def _write_atomic(self, path, data):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, url):
+        """Cached entry for url (without the body), or None"""
+        try:
+            with open(self._path(url, 'json'), 'r') as f:
+                entry = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        return entry if entry.get('url') == url else None
+
+    def get_body(self, url):
+        """Cached raw body for url, or None"""
+        try:
+            with open(self._path(url, 'body'), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since headers for a revalidation request"""
+        entry = self.get(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url, headers, body, airdrops):
+        """
+        Store a 200 response
+
+        Responses with neither ETag nor Last-Modified can't be revalidated,
+        so they are not cached. body may be None for streamed responses,
+        in which case only the parsed airdrops are kept.
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        entry = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+            'airdrops': airdrops
+        }
+        if body is not None:
+            self._write_atomic(self._path(url, 'body'), body)
+        elif os.path.exists(self._path(url, 'body')):
+            os.remove(self._path(url, 'body'))
+        self._write_atomic(self._path(url, 'json'), json.dumps(entry).encode('utf-8'))
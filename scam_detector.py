@@ -0,0 +1,157 @@
+"""
+Scam Detector - compiled multi-pattern red-flag matching for airdrops
+Every phrase and blocked domain is compiled into one Aho-Corasick automaton,
+so checking an airdrop is a single pass over its text no matter how many
+rules are loaded.
+
+Extra rules can be loaded from a JSON file:
+    {"phrases": ["connect seed", ...], "domains": ["free-eth-drop.com", ...]}
+"""
+
+import json
+from collections import deque
+
+DEFAULT_RED_FLAGS = [
+    'send eth', 'send bnb', 'private key', 'seed phrase',
+    'double your', 'guaranteed', 'elon musk', 'giveaway'
+]
+
+# Airdrop fields that are checked, in scan order
+SCANNED_FIELDS = ['name', 'description', 'link', 'website', 'tasks']
+
+# Characters that may not touch a blocked domain (so "eth.com" won't fire on "myeth.com")
+_DOMAIN_CHARS = set('abcdefghijklmnopqrstuvwxyz0123456789-')
+
+
+class AhoCorasick:
+    """Aho-Corasick automaton over lowercase strings"""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]  # pattern ids ending at each state
+        self.patterns = []
+
+        for pattern in patterns:
+            self._add(pattern)
+        self._build()
+
+    def _add(self, pattern):
+        state = 0
+        for char in pattern:
+            next_state = self.goto[state].get(char)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][char] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append(len(self.patterns))
+        self.patterns.append(pattern)
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def iter_matches(self, text):
+        """Yield (end_index, pattern_id) for every match in text"""
+        goto, fail, output = self.goto, self.fail, self.output
+        state = 0
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in output[state]:
+                yield i, pattern_id
+
+
+class ScamDetector:
+    """
+    Red-flag rules compiled into one automaton
+
+    Args:
+        phrases: Red-flag phrases (substring match, case-insensitive)
+        domains: Blocked domains (matched as whole domains or subdomains)
+    """
+
+    def __init__(self, phrases=None, domains=None):
+        phrases = DEFAULT_RED_FLAGS if phrases is None else phrases
+        self.rules = []  # (pattern, kind)
+        seen = set()
+        for kind, patterns in (('phrase', phrases), ('domain', domains or [])):
+            for pattern in patterns:
+                pattern = pattern.strip().lower()
+                if pattern and pattern not in seen:
+                    seen.add(pattern)
+                    self.rules.append((pattern, kind))
+
+        self.automaton = AhoCorasick(pattern for pattern, _ in self.rules)
+
+    @classmethod
+    def from_config(cls, config):
+        """Default rules plus config 'scam_phrases' / 'blocked_domains' / 'scam_rules_file'"""
+        phrases = list(DEFAULT_RED_FLAGS) + list(config.get('scam_phrases', []))
+        domains = list(config.get('blocked_domains', []))
+
+        rules_file = config.get('scam_rules_file')
+        if rules_file:
+            with open(rules_file, 'r') as f:
+                rules = json.load(f)
+            phrases.extend(rules.get('phrases', []))
+            domains.extend(rules.get('domains', []))
+
+        return cls(phrases, domains)
+
+    def _text(self, airdrop):
+        """Lowercased scan text plus the (start, field) offset of each field"""
+        parts, offsets, position = [], [], 0
+        for field in SCANNED_FIELDS:
+            value = airdrop.get(field)
+            if not value:
+                continue
+            if isinstance(value, (list, tuple)):
+                value = '\n'.join(str(item) for item in value)
+            value = str(value).lower()
+            offsets.append((position, field))
+            parts.append(value)
+            position += len(value) + 1  # newline separator - no rule spans fields
+        return '\n'.join(parts), offsets
+
+    def scan(self, airdrop):
+        """
+        Check name, description, link, website and tasks in one pass
+
+        Returns:
+            List of fired rules: {'rule', 'kind', 'field'} (empty = clean)
+        """
+        text, offsets = self._text(airdrop)
+        fired, seen = [], set()
+
+        for end, rule_id in self.automaton.iter_matches(text):
+            pattern, kind = self.rules[rule_id]
+            start = end - len(pattern) + 1
+
+            if kind == 'domain':
+                before = text[start - 1] if start > 0 else ''
+                after = text[end + 1] if end + 1 < len(text) else ''
+                if before in _DOMAIN_CHARS or after in _DOMAIN_CHARS:
+                    continue
+
+            field = next(name for offset, name in reversed(offsets) if offset <= start)
+            if (rule_id, field) not in seen:
+                seen.add((rule_id, field))
+                fired.append({'rule': pattern, 'kind': kind, 'field': field})
+
+        return fired
+
+    def is_legitimate(self, airdrop):
+        return not self.scan(airdrop)
@@ -0,0 +1,152 @@
+"""
+Scan Daemon - refresh slow data in the background, serve it from memory
+Jobs (scans, agent pipelines) run on an interval; each finished job publishes
+a new immutable Snapshot, swapped in with a single assignment. Command
+handlers only read `daemon.snapshot`, so they never wait on a source.
+
+    daemon = ScanDaemon({'airdrops': scanner.scan_all}, interval=900)
+    application = Application.builder().token(token).post_init(daemon.post_init).build()
+    ...
+    airdrops = daemon.snapshot.get('airdrops', ())
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from types import MappingProxyType
+
+from executors import run_io
+
+logger = logging.getLogger(__name__)
+
+
+def freeze(value):
+    """Read-only copy: dicts -> mappingproxy, lists / tuples / sets -> tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class Snapshot:
+    """
+    Immutable result of the latest refresh of every job
+
+    Args:
+        data: {job name: frozen result}
+        version: Increments on every publish
+        errors: {job name: last error message} for jobs whose latest run failed
+        refreshed_at: {job name: datetime of its last successful run}
+    """
+
+    __slots__ = ('data', 'version', 'errors', 'refreshed_at')
+
+    def __init__(self, data=None, version=0, errors=None, refreshed_at=None):
+        object.__setattr__(self, 'data', MappingProxyType(dict(data or {})))
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'errors', MappingProxyType(dict(errors or {})))
+        object.__setattr__(self, 'refreshed_at', MappingProxyType(dict(refreshed_at or {})))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Snapshot is immutable")
+
+    def __contains__(self, job):
+        return job in self.data
+
+    def get(self, job, default=None):
+        return self.data.get(job, default)
+
+    def age(self, job):
+        """Seconds since the job last refreshed (None if it never has)"""
+        refreshed = self.refreshed_at.get(job)
+        return (datetime.now() - refreshed).total_seconds() if refreshed else None
+
+
+class ScanDaemon:
+    """
+    Periodic background refresh
+
+    Args:
+        jobs: {name: callable}, run in order every cycle. Plain functions run on the
+              executors I/O pool so they can block; coroutine functions are awaited.
+        interval: Seconds between the start of one cycle and the next
+        on_result: Optional `async def on_result(job, result)`, awaited after each
+                   successful job (e.g. to push scan changes to subscribers)
+    """
+
+    def __init__(self, jobs, interval=900.0, on_result=None):
+        self.jobs = dict(jobs)
+        self.interval = interval
+        self.on_result = on_result
+        self.snapshot = Snapshot()
+        self._task = None
+
+    def publish(self, job, result=None, error=None):
+        """Swap in a new snapshot with one job's result (or error) updated"""
+        current = self.snapshot
+        data, errors, refreshed_at = dict(current.data), dict(current.errors), dict(current.refreshed_at)
+        if error is None:
+            data[job] = freeze(result)
+            errors.pop(job, None)
+            refreshed_at[job] = datetime.now()
+        else:
+            errors[job] = error  # keep serving the last good result
+        self.snapshot = Snapshot(data, current.version + 1, errors, refreshed_at)
+
+    async def run_job(self, name):
+        func = self.jobs[name]
+        started = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(func):
+                result = await func()
+            else:
+                result = await run_io(func)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Background job {name} failed: {e}")
+            self.publish(name, error=str(e))
+            return
+        self.publish(name, result)
+        logger.info(f"🔄 {name} refreshed in {time.perf_counter() - started:.2f}s")
+
+        if self.on_result is not None:
+            try:
+                await self.on_result(name, result)
+            except Exception as e:
+                logger.error(f"Result handler for {name} failed: {e}")
+
+    async def refresh(self):
+        """Run every job once, publishing after each"""
+        for name in self.jobs:
+            await self.run_job(name)
+
+    async def _loop(self):
+        while True:
+            started = time.monotonic()
+            await self.refresh()
+            await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self):
+        """Start refreshing on the running event loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop())
+        return self._task
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # python-telegram-bot Application hooks
+    async def post_init(self, application):
+        self.start()
+
+    async def post_shutdown(self, application):
+        await self.stop()
@@ -0,0 +1,221 @@
+"""
+Async Scan Engine - fetches every scan source concurrently
+One scan cycle takes about as long as the slowest source, not the sum of all of them
+"""
+
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+import http_client
+from circuit_breaker import BreakerRegistry
+from html_parser import StreamingCardParser, extract_cards
+from rate_limit import HostRateLimiter
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+class ScanSource:
+    """
+    A scan source: where to fetch from, how to parse it and how fast to poll it
+
+    Either pass `parse(html_bytes) -> list of airdrops`, or describe the
+    listing with `cards` (a CardSpec), `limit` and `build(card) -> airdrop or None`.
+    Card-based sources can be parsed while the page is still streaming in.
+    """
+
+    def __init__(self, name, url, parse=None, rps=1.0, burst=1, cards=None, limit=None, build=None):
+        self.name = name
+        self.url = url
+        self._parse = parse
+        self.rps = rps  # requests-per-second budget for this source
+        self.burst = burst
+        self.cards = cards
+        self.limit = limit
+        self.build = build
+
+    @property
+    def streamable(self):
+        return self.cards is not None
+
+    def parse(self, html):
+        """Parse a whole page into airdrops"""
+        if self._parse is not None:
+            return self._parse(html)
+        return self.build_all(extract_cards(html, self.cards, self.limit))
+
+    def build_all(self, cards):
+        """Turn extracted card fields into airdrops, dropping rejected cards"""
+        airdrops = []
+        for card in cards:
+            airdrop = self.build(card)
+            if airdrop is not None:
+                airdrops.append(airdrop)
+        return airdrops
+
+    @property
+    def host(self):
+        return urlsplit(self.url).netloc
+
+    def __repr__(self):
+        return f"ScanSource({self.name!r}, {self.url!r})"
+
+
+class AsyncScanEngine:
+    """
+    Fetch all sources at the same time over the shared pooled HTTP client
+
+    Args:
+        per_host_limit: Max in-flight requests per host
+        deadline: Global deadline (seconds) for a whole scan cycle
+        timeout: Per-request timeout (seconds)
+        cache: Optional ResponseCache for conditional (ETag / Last-Modified) requests
+        stream: Parse card-based sources incrementally while the page downloads
+        breakers: BreakerRegistry; sources whose breaker is open are skipped
+    """
+
+    def __init__(self, per_host_limit=2, deadline=30.0, timeout=10.0, headers=None, cache=None,
+                 stream=True, breakers=None):
+        self.per_host_limit = per_host_limit
+        self.deadline = deadline
+        self.timeout = timeout
+        self.cache = cache
+        self.stream = stream
+        self.headers = headers or DEFAULT_HEADERS
+        self.rate_limiter = HostRateLimiter()
+        self.breakers = breakers or BreakerRegistry()
+
+    async def scan(self, sources):
+        """
+        Scan every source concurrently
+
+        Returns:
+            Dict of source name -> list of airdrops, in source order.
+            Sources that fail or miss the deadline map to None.
+        """
+        host_limits = {}
+        for source in sources:
+            if source.host not in host_limits:
+                host_limits[source.host] = asyncio.Semaphore(self.per_host_limit)
+            self.rate_limiter.configure(source.host, source.rps, source.burst)
+
+        results = {source.name: None for source in sources}
+
+        # A source that keeps failing is left alone until its breaker lets a probe through
+        active = []
+        for source in sources:
+            if self.breakers.get(source.name).allow_request():
+                active.append(source)
+            else:
+                print(f"⚡ {source.name} circuit open, skipping")
+        sources = active
+        if not sources:
+            return results
+
+        # The loop's shared keep-alive pool; sync callers (scan_sync, the scan daemon)
+        # all run on http_client's long-lived loop, so repeat scans reuse connections
+        client = http_client.get_async_client()
+        tasks = {
+            asyncio.create_task(self._scan_source(client, source, host_limits[source.host])): source
+            for source in sources
+        }
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+
+        for task in pending:
+            task.cancel()
+            print(f"⏱️ {tasks[task].name} missed the {self.deadline}s scan deadline")
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for task in done:
+            source = tasks[task]
+            if task.exception() is None:
+                results[source.name] = task.result()
+
+        return results
+
+    async def _scan_source(self, client, source, host_limit):
+        """Fetch and parse a single source, feeding the outcome to its breaker"""
+        breaker = self.breakers.get(source.name)
+        started = time.perf_counter()
+        airdrops = None
+        try:
+            airdrops = await self._fetch_source(client, source, host_limit)
+        finally:
+            # Also runs when the scan deadline cancels us - that counts as a failure
+            elapsed = time.perf_counter() - started
+            if airdrops is None:
+                breaker.record_failure(elapsed)
+            else:
+                breaker.record_success(elapsed)
+        return airdrops
+
+    async def _fetch_source(self, client, source, host_limit):
+        print(f"🔍 Scanning {source.name}...")
+        started = time.perf_counter()
+
+        try:
+            # Wait for the host's token bucket before taking a connection slot
+            await self.rate_limiter.acquire(source.host)
+            headers = dict(self.headers)
+            if self.cache:
+                headers.update(self.cache.conditional_headers(source.url))
+            async with host_limit:
+                async with client.stream('GET', source.url, headers=headers,
+                                         timeout=self.timeout) as response:
+                    if response.status_code == 304 and self.cache:
+                        return self._cached_airdrops(source)
+
+                    if response.status_code != 200:
+                        print(f"❌ {source.name} returned HTTP {response.status_code}")
+                        return None
+
+                    if self.stream and source.streamable:
+                        airdrops = await self._parse_stream(source, response)
+                        body = None  # never held in memory
+                    else:
+                        body = await response.aread()
+                        airdrops = source.parse(body)
+
+            if self.cache:
+                self.cache.put(source.url, response.headers, body, airdrops)
+            elapsed = time.perf_counter() - started
+            print(f"✅ Found {len(airdrops)} airdrops on {source.name} ({elapsed:.2f}s)")
+            return airdrops
+
+        except Exception as e:
+            print(f"❌ Error scanning {source.name}: {e}")
+            return None
+
+    def _cached_airdrops(self, source):
+        """Unchanged since last scan - reuse the parsed result, skip the parse"""
+        entry = self.cache.get(source.url)
+        if entry and entry.get('airdrops') is not None:
+            print(f"♻️ {source.name} unchanged (304), {len(entry['airdrops'])} cached airdrops")
+            return entry['airdrops']
+        body = self.cache.get_body(source.url)
+        return source.parse(body) if body is not None else []
+
+    async def _parse_stream(self, source, response):
+        """
+        Feed the body chunk by chunk into an incremental parser
+
+        Cards are built as soon as they close, and reading stops once the
+        source's card limit is reached (leaving the stream closes the socket).
+        """
+        parser = StreamingCardParser(source.cards, source.limit)
+        cards = []
+
+        async for chunk in response.aiter_bytes():
+            cards.extend(parser.feed(chunk))
+            if parser.done:
+                break
+        cards.extend(parser.close())
+
+        return source.build_all(cards)
+
+    def scan_sync(self, sources):
+        """Blocking wrapper around scan() for sync callers"""
+        return http_client.run(self.scan(sources))
@@ -3,149 +3,123 @@ Crypto Airdrop Hunter Bot - Main Scanner Module
 Automatically discovers and tracks FREE crypto airdrops
 """
 
-import requests
-from bs4 import BeautifulSoup
-import json
-from datetime import datetime
-import time
+import http_client
+from airdrop_store import AirdropStore
+from circuit_breaker import BreakerRegistry
+from dedup import merge_airdrops
+from scam_detector import ScamDetector
+from scan_engine import AsyncScanEngine
+from response_cache import ResponseCache
+from sources import get_sources, SOURCE_REGISTRY
 
 class AirdropScanner:
     def __init__(self, config):
         self.config = config
         self.airdrops = []
         
+        # Every registered source is fetched concurrently by scan_all(),
+        # throttled only by its own per-host requests-per-second budget
+        self.sources = get_sources(config.get('enabled_sources'))
+        self.engine = AsyncScanEngine(
+            per_host_limit=config.get('scan_per_host_limit', 2),
+            deadline=config.get('scan_deadline_seconds', 30),
+            timeout=config.get('scan_timeout_seconds', 10),
+            # Unchanged pages come back as 304 and skip parsing entirely
+            cache=ResponseCache(config.get('scan_cache_dir', '.scan_cache')),
+            # Parse pages while they download and stop at each source's card limit
+            stream=config.get('scan_streaming', True),
+            # A source that keeps failing is skipped, then probed again after a cool-down
+            breakers=BreakerRegistry(
+                failure_threshold=config.get('breaker_failure_threshold', 3),
+                recovery_timeout=config.get('breaker_recovery_seconds', 300)
+            )
+        )
+        # Red-flag phrases and blocked domains, compiled once
+        self.scam_detector = ScamDetector.from_config(config)
+        # Scan history persists across runs
+        self.store = AirdropStore(config.get('db_path', 'airdrops.db'))
+        
+    def scan_source(self, name):
+        """Scan a single registered source"""
+        return self.engine.scan_sync([SOURCE_REGISTRY[name]])[name] or []
+    
     def scan_cryptorank(self):
         """Scan CryptoRank for latest airdrops"""
-        print("🔍 Scanning CryptoRank...")
-        
-        try:
-            # CryptoRank API endpoint (public data)
-            url = "https://cryptorank.io/drophunting"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Parse airdrop data (simplified - actual parsing depends on site structure)
-                airdrops_found = []
-                
-                # Example structure - adjust based on actual HTML
-                airdrop_cards = soup.find_all('div', class_='airdrop-card')
-                
-                for card in airdrop_cards[:10]:  # Top 10
-                    try:
-                        name = card.find('h3').text.strip()
-                        status = card.find('span', class_='status').text.strip()
-                        value = card.find('span', class_='value').text.strip()
-                        
-                        # Only FREE airdrops
-                        if 'free' in value.lower() or '$0' in value:
-                            airdrops_found.append({
-                                'name': name,
-                                'status': status,
-                                'value': value,
-                                'source': 'CryptoRank',
-                                'timestamp': datetime.now().isoformat()
-                            })
-                    except:
-                        continue
-                
-                print(f"✅ Found {len(airdrops_found)} FREE airdrops on CryptoRank")
-                return airdrops_found
-                
-        except Exception as e:
-            print(f"❌ Error scanning CryptoRank: {e}")
-            return []
+        return self.scan_source('CryptoRank')
     
     def scan_airdrops_io(self):
         """Scan Airdrops.io for latest opportunities"""
-        print("🔍 Scanning Airdrops.io...")
-        
-        try:
-            url = "https://airdrops.io"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            
-            response = requests.get(url, headers=headers, timeout=10)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                airdrops_found = []
-                
-                # Parse active airdrops
-                airdrop_items = soup.find_all('div', class_='airdrop-item')
-                
-                for item in airdrop_items[:10]:
-                    try:
-                        name = item.find('h4').text.strip()
-                        link = item.find('a')['href']
-                        
-                        airdrops_found.append({
-                            'name': name,
-                            'link': link,
-                            'source': 'Airdrops.io',
-                            'timestamp': datetime.now().isoformat()
-                        })
-                    except:
-                        continue
-                
-                print(f"✅ Found {len(airdrops_found)} airdrops on Airdrops.io")
-                return airdrops_found
-                
-        except Exception as e:
-            print(f"❌ Error scanning Airdrops.io: {e}")
-            return []
+        return self.scan_source('Airdrops.io')
+    
+    def source_health(self):
+        """Breaker state and 0-100 health score per source, e.g. {'CryptoRank': {'state': 'closed', 'health': 97, ...}}"""
+        health = self.engine.breakers.health()
+        return {source.name: health.get(source.name) for source in self.sources}
     
     def check_legitimacy(self, airdrop):
         """Basic scam detection"""
-        red_flags = [
-            'send eth', 'send bnb', 'private key', 'seed phrase',
-            'double your', 'guaranteed', 'elon musk', 'giveaway'
-        ]
-        
-        name_lower = airdrop.get('name', '').lower()
-        
-        for flag in red_flags:
-            if flag in name_lower:
-                return False
-        
-        return True
+        return self.scam_detector.is_legitimate(airdrop)
     
-    def scan_all(self):
-        """Run all scanners"""
+    def legitimacy_report(self, airdrop):
+        """Red-flag rules that fired for an airdrop (empty list = looks legit)"""
+        return self.scam_detector.scan(airdrop)
+    
+    async def _scan(self):
+        """Scan, filter and dedupe; returns (airdrops, sources scanned successfully)"""
         print("\n🚀 Starting Airdrop Hunt...\n")
         
-        all_airdrops = []
-        
-        # Scan multiple sources
-        all_airdrops.extend(self.scan_cryptorank())
-        time.sleep(2)  # Rate limiting
+        results = await self.engine.scan(self.sources)
         
-        all_airdrops.extend(self.scan_airdrops_io())
+        all_airdrops = []
+        scanned_sources = set()
+        for name, airdrops in results.items():
+            if airdrops is not None:
+                scanned_sources.add(name)
+                all_airdrops.extend(airdrops)
         
         # Filter legitimate only
         legitimate = [a for a in all_airdrops if self.check_legitimacy(a)]
         
-        # Remove duplicates
-        unique_airdrops = []
-        seen_names = set()
-        
-        for airdrop in legitimate:
-            name = airdrop.get('name', '')
-            if name not in seen_names:
-                unique_airdrops.append(airdrop)
-                seen_names.add(name)
+        # Merge near-duplicates across sources ("PrismaX" / "Prisma X" / "prismax airdrop")
+        unique_airdrops = merge_airdrops(legitimate, self.config.get('dedup_threshold', 0.7))
         
         self.airdrops = unique_airdrops
         
         print(f"\n✅ Total legitimate airdrops found: {len(unique_airdrops)}\n")
         
-        return unique_airdrops
+        return unique_airdrops, scanned_sources
+    
+    async def scan_changes_async(self):
+        """
+        Scan and return only what changed since the last persisted scan
+        
+        Returns:
+            {'added': [...], 'changed': [...], 'removed': [...], 'baseline': bool}
+            baseline is True when the history was empty, so everything counts as added
+        """
+        airdrops, scanned_sources = await self._scan()
+        baseline = self.store.count() == 0
+        changes = self.store.apply_scan(airdrops, sources=scanned_sources)
+        changes['baseline'] = baseline
+        
+        print(f"🔄 Changes: {len(changes['added'])} new, {len(changes['changed'])} changed, "
+              f"{len(changes['removed'])} removed")
+        
+        return changes
+    
+    def scan_changes(self):
+        """Scan and return only new / changed / removed airdrops"""
+        return http_client.run(self.scan_changes_async())
+    
+    async def scan_all_async(self):
+        """Run all scanners concurrently (use this from inside an event loop)"""
+        airdrops, scanned_sources = await self._scan()
+        self.store.apply_scan(airdrops, sources=scanned_sources)
+        return airdrops
+    
+    def scan_all(self):
+        """Run all scanners"""
+        return http_client.run(self.scan_all_async())
     
     def get_current_airdrops(self):
         """Get manually curated current airdrops"""
@@ -179,18 +153,10 @@ class AirdropScanner:
             }
         ]
     
-    def save_results(self, filename='airdrops.json'):
-        """Save scan results to file"""
-        data = {
-            'scan_time': datetime.now().isoformat(),
-            'total_found': len(self.airdrops),
-            'airdrops': self.airdrops
-        }
-        
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
-        
-        print(f"💾 Results saved to {filename}")
+    def save_results(self):
+        """Save scan results to the airdrop store"""
+        saved = self.store.upsert_many(self.airdrops)
+        print(f"💾 {saved} results saved to {self.store.path}")
 
 if __name__ == "__main__":
     # Test scanner
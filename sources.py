@@ -0,0 +1,96 @@
+"""
+Scan Sources - plugin registry of airdrop listing sites
+Each source declares its URL, parser and requests-per-second budget.
+
+Add a card-based source (parsed while the page streams in):
+
+    @register_source('MySite', 'https://mysite.io/airdrops', rps=1.0,
+                     cards=CardSpec('div.card', {'name': 'h3'}), limit=10)
+    def mysite_airdrop(card):
+        return {'name': card['name'], 'source': 'MySite'}  # or None to skip
+
+Or one with a custom whole-page parser:
+
+    @register_source('MySite', 'https://mysite.io/airdrops', rps=1.0)
+    def parse_mysite(html):
+        return [{'name': ..., 'source': 'MySite', ...}]
+"""
+
+from datetime import datetime
+from html_parser import CardSpec
+from scan_engine import ScanSource
+
+CRYPTORANK_URL = "https://cryptorank.io/drophunting"
+AIRDROPS_IO_URL = "https://airdrops.io"
+
+SOURCE_REGISTRY = {}
+
+
+def register_source(name, url, rps=1.0, burst=1, cards=None, limit=None):
+    """
+    Decorator that registers a scan source
+
+    With `cards`, the decorated function builds one airdrop from one card's
+    fields; without, it parses a whole page.
+    """
+    def decorator(func):
+        if cards is None:
+            source = ScanSource(name, url, parse=func, rps=rps, burst=burst)
+        else:
+            source = ScanSource(name, url, rps=rps, burst=burst, cards=cards, limit=limit, build=func)
+        SOURCE_REGISTRY[name] = source
+        return func
+    return decorator
+
+
+def get_sources(names=None):
+    """Registered sources in registration order, optionally only `names`"""
+    if names is None:
+        return list(SOURCE_REGISTRY.values())
+    return [SOURCE_REGISTRY[name] for name in names if name in SOURCE_REGISTRY]
+
+
+# ==================== Built-in Sources ====================
+
+# Simplified card layouts - adjust based on actual HTML
+CRYPTORANK_CARDS = CardSpec('div.airdrop-card', {
+    'name': 'h3',
+    'status': 'span.status',
+    'value': 'span.value'
+})
+
+AIRDROPS_IO_CARDS = CardSpec('div.airdrop-item', {
+    'name': 'h4',
+    'link': ('a', 'href')
+})
+
+
+@register_source('CryptoRank', CRYPTORANK_URL, rps=0.5, cards=CRYPTORANK_CARDS, limit=10)  # Top 10
+def cryptorank_airdrop(card):
+    """Build a CryptoRank airdrop - FREE airdrops only"""
+    if 'free' not in card['value'].lower() and '$0' not in card['value']:
+        return None
+
+    return {
+        'name': card['name'],
+        'status': card['status'],
+        'value': card['value'],
+        'source': 'CryptoRank',
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+@register_source('Airdrops.io', AIRDROPS_IO_URL, rps=0.5, cards=AIRDROPS_IO_CARDS, limit=10)
+def airdrops_io_airdrop(card):
+    """Build an Airdrops.io airdrop"""
+    return {
+        'name': card['name'],
+        'link': card['link'],
+        'source': 'Airdrops.io',
+        'timestamp': datetime.now().isoformat()
+    }
+
+
+# Whole-page parsers for the built-in sources
+parse_cryptorank = SOURCE_REGISTRY['CryptoRank'].parse
+parse_airdrops_io = SOURCE_REGISTRY['Airdrops.io'].parse
@@ -0,0 +1,219 @@
+"""
+Startup Profiler - where does a cold start go?
+Set STARTUP_PROFILE=1 (or a report path) and the bot records, relative to
+process start:
+
+- every module import, with self and cumulative time (like -X importtime),
+  attributed to the startup phase it happened in
+- the bot's own phases (config, init, handler registration, post_init)
+- time to the first update
+
+A JSON report is written when the first update arrives and again at exit
+(default: startup_profile.json). Without the variable everything is a no-op.
+
+    import startup_profiler
+    startup_profiler.install()          # first lines of the entry point
+    with startup_profiler.phase('handlers'):
+        ...
+    startup_profiler.watch_first_update(application)
+"""
+
+import atexit
+import contextlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT_PATH = 'startup_profile.json'
+TOP_IMPORTS = 30
+
+_profiler = None
+
+
+class _ImportTimer:
+    """Meta-path finder that times each module's execution"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.local = threading.local()
+
+    def find_spec(self, name, path=None, target=None):
+        if getattr(self.local, 'finding', False):
+            return None
+        self.local.finding = True
+        try:
+            # Let the real finders locate the module, then time its loader
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self.local.finding = False
+
+        loader = spec.loader
+        # Built-in / frozen importers are shared classes - only wrap per-module loader instances
+        if loader is None or isinstance(loader, type) or not hasattr(loader, 'exec_module'):
+            return spec
+        exec_module = loader.exec_module
+
+        def timed_exec_module(module):
+            stack = self.local.__dict__.setdefault('stack', [])
+            stack.append(0.0)  # time spent in nested imports
+            started = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed = time.perf_counter() - started
+                children = stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+                self.profiler.record_import(name, elapsed - children, elapsed, started)
+
+        loader.exec_module = timed_exec_module
+        return spec
+
+
+class StartupProfiler:
+    def __init__(self, report_path):
+        self.report_path = report_path
+        self.origin = time.perf_counter()
+        self.entry = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else 'python'
+        self.imports = []  # (module, self_seconds, cumulative_seconds, phase, started)
+        self.phases = []  # {'name', 'start_ms', 'duration_ms'}
+        self.marks = {}
+        self.current_phase = 'imports'
+        self.finder = _ImportTimer(self)
+        self._lock = threading.Lock()
+
+    def ms(self, moment):
+        return round((moment - self.origin) * 1000, 2)
+
+    def record_import(self, module, self_seconds, cumulative_seconds, started):
+        with self._lock:
+            self.imports.append((module, self_seconds, cumulative_seconds, self.current_phase, started))
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        previous, self.current_phase = self.current_phase, name
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({
+                'name': name,
+                'start_ms': self.ms(started),
+                'duration_ms': round((time.perf_counter() - started) * 1000, 2)
+            })
+            self.current_phase = previous
+
+    def mark(self, name):
+        if name not in self.marks:
+            self.marks[name] = self.ms(time.perf_counter())
+
+    def report(self):
+        imports_by_phase, by_package = {}, {}
+        for module, self_seconds, _, phase_name, _ in self.imports:
+            imports_by_phase[phase_name] = imports_by_phase.get(phase_name, 0.0) + self_seconds
+            package = module.split('.')[0]
+            by_package[package] = by_package.get(package, 0.0) + self_seconds
+
+        top = sorted(self.imports, key=lambda item: item[2], reverse=True)[:TOP_IMPORTS]
+        return {
+            'entry': self.entry,
+            'pid': os.getpid(),
+            'python': sys.version.split()[0],
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'elapsed_ms': self.ms(time.perf_counter()),
+            'marks_ms': self.marks,
+            'phases': self.phases,
+            'imports': {
+                'count': len(self.imports),
+                'total_ms': round(sum(item[1] for item in self.imports) * 1000, 2),
+                'by_phase_ms': {name: round(seconds * 1000, 2) for name, seconds in imports_by_phase.items()},
+                'by_package_ms': {
+                    name: round(seconds * 1000, 2)
+                    for name, seconds in sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+                },
+                'slowest': [
+                    {
+                        'module': module,
+                        'self_ms': round(self_seconds * 1000, 2),
+                        'cumulative_ms': round(cumulative_seconds * 1000, 2),
+                        'phase': phase_name,
+                        'at_ms': self.ms(started)
+                    }
+                    for module, self_seconds, cumulative_seconds, phase_name, started in top
+                ]
+            }
+        }
+
+    def write_report(self):
+        report = self.report()
+        with open(self.report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        summary = ", ".join(f"{p['name']} {p['duration_ms']:.0f}ms" for p in report['phases'])
+        logger.info(f"⏱️ Startup profile: {report['imports']['count']} imports "
+                    f"({report['imports']['total_ms']:.0f}ms), {summary}; "
+                    f"first update at {report['marks_ms'].get('first_update', '-')}ms "
+                    f"-> {self.report_path}")
+        return report
+
+
+# ==================== Module API (no-ops unless installed) ====================
+
+def install():
+    """Start profiling if STARTUP_PROFILE is set; call before any heavy import"""
+    global _profiler
+    setting = os.getenv('STARTUP_PROFILE', '')
+    if _profiler is not None or setting.lower() in ('', '0', 'false', 'no'):
+        return _profiler
+
+    _profiler = StartupProfiler(DEFAULT_REPORT_PATH if setting == '1' else setting)
+    sys.meta_path.insert(0, _profiler.finder)
+    atexit.register(_profiler.write_report)
+    return _profiler
+
+
+def enabled():
+    return _profiler is not None
+
+
+def phase(name):
+    """Context manager timing one startup phase"""
+    return _profiler.phase(name) if _profiler else contextlib.nullcontext()
+
+
+def mark(name):
+    """Record the first time `name` happened"""
+    if _profiler:
+        _profiler.mark(name)
+
+
+def watch_first_update(application):
+    """Mark the first update a python-telegram-bot Application receives, then write the report"""
+    if not _profiler:
+        return
+    from telegram import Update
+    from telegram.ext import TypeHandler
+
+    async def first_update(update, context):
+        if 'first_update' not in _profiler.marks:
+            _profiler.mark('first_update')
+            _profiler.write_report()
+
+    # Its own group, so it runs alongside (not instead of) the real handlers
+    application.add_handler(TypeHandler(Update, first_update), group=-100)
+
+
+def write_report():
+    return _profiler.write_report() if _profiler else None
@@ -0,0 +1,290 @@
+"""
+Subscriptions - push new airdrops to the chats that asked for them
+Each chat's preferences use the same `notification_settings` /
+`filter_settings` keys as config.json. Subscriptions live in SQLite and in
+an in-memory index, so matching an event costs set operations over the
+chats a filter excludes, not a loop over every subscriber and filter.
+
+    subscriptions = Subscriptions('airdrops.db', defaults=config)
+    subscriptions.subscribe(chat_id)
+    subscriptions.fan_out(changes, outbox)   # changes from AirdropScanner.scan_changes()
+"""
+
+import bisect
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+from message_queue import PRIORITY_LOW
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS subscriptions (
+    chat_id INTEGER PRIMARY KEY,
+    notification_settings TEXT NOT NULL,
+    filter_settings TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+DEFAULT_NOTIFICATION_SETTINGS = {
+    'new_airdrops': True,
+    'daily_tasks': True,
+    'value_updates': False
+}
+
+DEFAULT_FILTER_SETTINGS = {
+    'min_estimated_value': 0,
+    'only_confirmed': False,
+    'exclude_testnets': False,
+    'preferred_chains': []
+}
+
+# Change kind -> notification setting that opts in to it
+EVENT_SETTINGS = {
+    'added': 'new_airdrops',
+    'changed': 'value_updates'
+}
+
+MAX_DIGEST_ITEMS = 10
+
+_DOLLARS = re.compile(r'\$\s*([\d,]+(?:\.\d+)?)\s*([kKmM]?)')
+_MULTIPLIERS = {'': 1, 'k': 1_000, 'm': 1_000_000}
+
+
+def estimated_value(airdrop):
+    """Highest dollar amount in the airdrop's value ('$100-500' -> 500.0), None if there is none"""
+    amounts = [
+        float(number.replace(',', '')) * _MULTIPLIERS[suffix.lower()]
+        for number, suffix in _DOLLARS.findall(str(airdrop.get('value') or ''))
+    ]
+    return max(amounts) if amounts else None
+
+
+def is_testnet(airdrop):
+    tasks = airdrop.get('tasks') or []
+    text = ' '.join([str(airdrop.get('name', '')), str(airdrop.get('status', ''))] + [str(t) for t in tasks])
+    return 'testnet' in text.lower()
+
+
+def airdrop_chains(airdrop):
+    """Lowercased chains an airdrop is on (empty if the listing doesn't say)"""
+    chains = airdrop.get('chains') or airdrop.get('chain') or []
+    if isinstance(chains, str):
+        chains = [chains]
+    return {chain.strip().lower() for chain in chains if chain}
+
+
+class SubscriptionIndex:
+    """
+    Inverted index from filter values to chat IDs
+
+    Every filter is stored as "who does this exclude", so an event's
+    audience is the opted-in set minus a few (usually small) exclusion sets.
+    """
+
+    def __init__(self):
+        self.settings = {}  # chat_id -> (notification_settings, filter_settings)
+        self.by_event = {kind: set() for kind in EVENT_SETTINGS}
+        self.only_confirmed = set()
+        self.exclude_testnets = set()
+        self.chain_filtered = set()  # chats with a preferred_chains list
+        self.by_chain = {}  # chain -> chats that prefer it
+        self.min_values = []  # sorted (min_estimated_value, chat_id), only for minimums > 0
+
+    def add(self, chat_id, notification_settings, filter_settings):
+        self.remove(chat_id)
+        self.settings[chat_id] = (notification_settings, filter_settings)
+
+        for kind, setting in EVENT_SETTINGS.items():
+            if notification_settings.get(setting):
+                self.by_event[kind].add(chat_id)
+        if filter_settings.get('only_confirmed'):
+            self.only_confirmed.add(chat_id)
+        if filter_settings.get('exclude_testnets'):
+            self.exclude_testnets.add(chat_id)
+
+        chains = {chain.lower() for chain in filter_settings.get('preferred_chains') or []}
+        if chains:
+            self.chain_filtered.add(chat_id)
+            for chain in chains:
+                self.by_chain.setdefault(chain, set()).add(chat_id)
+
+        min_value = filter_settings.get('min_estimated_value') or 0
+        if min_value > 0:
+            bisect.insort(self.min_values, (min_value, chat_id))
+
+    def remove(self, chat_id):
+        settings = self.settings.pop(chat_id, None)
+        if settings is None:
+            return
+        _, filter_settings = settings
+
+        for chats in self.by_event.values():
+            chats.discard(chat_id)
+        self.only_confirmed.discard(chat_id)
+        self.exclude_testnets.discard(chat_id)
+        self.chain_filtered.discard(chat_id)
+        for chain in filter_settings.get('preferred_chains') or []:
+            chats = self.by_chain.get(chain.lower())
+            if chats is not None:
+                chats.discard(chat_id)
+                if not chats:
+                    del self.by_chain[chain.lower()]
+
+        min_value = filter_settings.get('min_estimated_value') or 0
+        if min_value > 0:
+            position = bisect.bisect_left(self.min_values, (min_value, chat_id))
+            if position < len(self.min_values) and self.min_values[position] == (min_value, chat_id):
+                del self.min_values[position]
+
+    def __len__(self):
+        return len(self.settings)
+
+    def match(self, kind, airdrop):
+        """Chat IDs that want this event"""
+        candidates = self.by_event.get(kind)
+        if not candidates:
+            return set()
+
+        excluded = set()
+        if str(airdrop.get('status', '')).lower() != 'confirmed':
+            excluded |= self.only_confirmed
+        if is_testnet(airdrop):
+            excluded |= self.exclude_testnets
+
+        # Listings that don't name a chain pass every chain filter
+        chains = airdrop_chains(airdrop)
+        if chains and self.chain_filtered:
+            wanted = set()
+            for chain in chains:
+                wanted |= self.by_chain.get(chain, set())
+            excluded |= self.chain_filtered - wanted
+
+        # Minimums above the airdrop's value exclude (unknown value counts as 0)
+        value = estimated_value(airdrop) or 0
+        cutoff = bisect.bisect_right(self.min_values, (value, float('inf')))
+        excluded.update(chat_id for _, chat_id in self.min_values[cutoff:])
+
+        return candidates - excluded if excluded else set(candidates)
+
+
+class Subscriptions:
+    """
+    Persistent subscriptions plus their match index
+
+    Args:
+        path: SQLite database (the airdrop store's file is fine)
+        defaults: Config whose notification_settings / filter_settings seed new subscriptions
+    """
+
+    def __init__(self, path='airdrops.db', defaults=None):
+        defaults = defaults or {}
+        self.default_notifications = {**DEFAULT_NOTIFICATION_SETTINGS,
+                                      **defaults.get('notification_settings', {})}
+        self.default_filters = {**DEFAULT_FILTER_SETTINGS, **defaults.get('filter_settings', {})}
+
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+        self.index = SubscriptionIndex()
+        for row in self.conn.execute("SELECT * FROM subscriptions"):
+            self.index.add(row['chat_id'], json.loads(row['notification_settings']),
+                           json.loads(row['filter_settings']))
+
+    def subscribe(self, chat_id, notification_settings=None, filter_settings=None):
+        """Create or update a chat's subscription; unspecified settings keep their current value"""
+        current = self.index.settings.get(chat_id, (self.default_notifications, self.default_filters))
+        notifications = {**current[0], **(notification_settings or {})}
+        filters = {**current[1], **(filter_settings or {})}
+        now = datetime.now().isoformat()
+
+        with self._lock, self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO subscriptions (chat_id, notification_settings, filter_settings, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (chat_id) DO UPDATE SET
+                    notification_settings = excluded.notification_settings,
+                    filter_settings = excluded.filter_settings,
+                    updated_at = excluded.updated_at
+                """,
+                (chat_id, json.dumps(notifications), json.dumps(filters), now, now)
+            )
+            self.index.add(chat_id, notifications, filters)
+        return notifications, filters
+
+    def unsubscribe(self, chat_id):
+        """Returns True if the chat was subscribed"""
+        with self._lock, self.conn:
+            deleted = self.conn.execute("DELETE FROM subscriptions WHERE chat_id = ?", (chat_id,)).rowcount
+            self.index.remove(chat_id)
+        return bool(deleted)
+
+    def is_subscribed(self, chat_id):
+        return chat_id in self.index.settings
+
+    def count(self):
+        return len(self.index)
+
+    def match(self, changes):
+        """
+        Group change events by recipient
+
+        Args:
+            changes: {'added': [...], 'changed': [...], ...} from a scan
+
+        Returns:
+            {chat_id: [(kind, airdrop), ...]}
+        """
+        matches = {}
+        for kind in EVENT_SETTINGS:
+            for airdrop in changes.get(kind, ()):
+                for chat_id in self.index.match(kind, airdrop):
+                    matches.setdefault(chat_id, []).append((kind, airdrop))
+        return matches
+
+    def fan_out(self, changes, outbox):
+        """Queue one digest per matching chat as low-priority broadcasts; returns chats notified"""
+        if changes.get('baseline'):
+            return 0  # first scan of an empty history - everything looks new
+
+        matches = self.match(changes)
+        for chat_id, events in matches.items():
+            outbox.send(chat_id, format_digest(events), priority=PRIORITY_LOW,
+                        disable_web_page_preview=True)
+        return len(matches)
+
+    def close(self):
+        self.conn.close()
+
+
+def format_digest(events):
+    """One message for all of a chat's matching events"""
+    added = [airdrop for kind, airdrop in events if kind == 'added']
+    changed = [airdrop for kind, airdrop in events if kind == 'changed']
+
+    lines = []
+    for title, airdrops in (("🆕 New airdrops", added), ("🔄 Updated airdrops", changed)):
+        if not airdrops:
+            continue
+        lines.append(f"{title} ({len(airdrops)}):")
+        for airdrop in airdrops[:MAX_DIGEST_ITEMS]:
+            line = f"• {airdrop.get('name', 'Unknown')}"
+            if airdrop.get('value'):
+                line += f" - {airdrop['value']}"
+            link = airdrop.get('link') or airdrop.get('website')
+            if link:
+                line += f"\n  {link}"
+            lines.append(line)
+        if len(airdrops) > MAX_DIGEST_ITEMS:
+            lines.append(f"…and {len(airdrops) - MAX_DIGEST_ITEMS} more")
+        lines.append("")
+
+    lines.append("Use /unsubscribe to stop these alerts.")
+    return "\n".join(lines)
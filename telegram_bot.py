@@ -3,14 +3,23 @@ Telegram Bot Integration for Airdrop Hunter
 Control your airdrop bot from anywhere via Telegram!
 """
 
+import startup_profiler
+startup_profiler.install()  # no-op unless STARTUP_PROFILE is set
+
 import logging
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, ContextTypes
 import asyncio
 from scanner import AirdropScanner
+from executors import run_io, shutdown as shutdown_executors
+from message_queue import MessageQueue
+from subscriptions import Subscriptions
+from scan_daemon import ScanDaemon
+from webhook_server import run_application
 from hotstuff_tracker import get_hotstuff_notification, get_hotstuff_opportunities, get_hotstuff_airdrop_analysis
 from datetime import datetime
 import json
+import templates
 
 # Enable logging
 logging.basicConfig(
@@ -19,16 +28,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-class TelegramAirdropBot:
-    def __init__(self, token, config):
-        self.token = token
-        self.config = config
-        self.scanner = AirdropScanner(config)
-        self.app = None
-        
-    async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Start command - Welcome message"""
-        welcome_text = """
+# Messages are compiled once; dynamic ones re-render only when their snapshot changes
+templates.register('welcome', """
 🚀 *Welcome to Crypto Airdrop Hunter Bot!*
 
 I'll help you find and claim FREE crypto airdrops automatically!
@@ -40,6 +41,7 @@ I'll help you find and claim FREE crypto airdrops automatically!
 /status - Check current airdrops
 /stats - View your earnings
 /remind - Set daily reminders
+/unsubscribe - Stop new airdrop alerts
 /settings - Configure bot
 /help - Show this message
 
@@ -50,7 +52,126 @@ I'll help you find and claim FREE crypto airdrops automatically!
 4. Click links and claim!
 
 Let's start earning! 💰
-        """
+""")
+
+templates.register('stats', """
+📈 *YOUR AIRDROP STATISTICS*
+
+🎯 *Current Active:*
+   • T-Rex: 1170 points
+   • PrismaX: 1782 points
+   • Hotstuff: 1265 points
+   • 🔥 HotStuff L1: Testnet active
+
+💰 *Estimated Value:*
+   • Conservative: $35-185
+   • Realistic: $185-750
+   • Optimistic: $750-1850+
+
+⏱️ *Time Investment:*
+   • Setup: 5 minutes (one-time)
+   • Daily: 10-15 minutes
+   • Total this month: ~5 hours
+
+📊 *ROI:*
+   • Potential: $50-500+/month
+   • Hourly rate: $10-100/hour
+   • Cost: $0 (FREE!)
+
+🔥 *Keep claiming daily for maximum earnings!*
+💡 *Don't miss HotStuff L1 testnet - use /hotstuff*
+""")
+
+templates.register('settings', """
+⚙️ *BOT SETTINGS*
+
+*Current Configuration:*
+✅ Auto-scan: Enabled
+✅ Notifications: Enabled
+✅ Daily reminders: Enabled
+✅ HotStuff tracking: Enabled
+
+*Customize:*
+• Reminder times
+• Notification preferences
+• Airdrop filters
+• Auto-claim settings
+
+Edit config.json file to customize settings.
+""")
+
+templates.register('scan', """
+✅ *Active FREE Airdrops Found!*
+
+{new_listings}{airdrops}
+
+💡 *NEW:* Try /hotstuff for HotStuff L1 testnet opportunities!
+
+Use /claim to get direct claim links!
+""")
+
+templates.register('status', """
+📊 *CURRENT AIRDROP STATUS*
+
+🎯 Active Airdrops: {active_count}
+💰 Total Potential Value: $30-1500+
+⏱️ Total Time Required: ~60 minutes
+💵 Total Cost: FREE
+🗂️ Scanned History: {tracked} airdrops tracked
+
+*Sources:*
+{sources}
+
+*Breakdown:*
+{breakdown}
+• 🔥 HotStuff L1: High potential (8/10)
+
+Use /claim to start earning!
+Use /hotstuff for HotStuff details!
+""")
+
+HEALTH_ICONS = {'closed': '🟢', 'half_open': '🟡', 'open': '🔴'}
+
+class TelegramAirdropBot:
+    def __init__(self, token, config):
+        self.token = token
+        self.config = config
+        self.scanner = AirdropScanner(config)
+        self.app = None
+        
+        # Scans run in the background; handlers only read the latest snapshot
+        self.daemon = ScanDaemon({
+            'airdrops': self.scanner.get_current_airdrops,
+            'changes': self.scanner.scan_changes,
+            'health': self.scanner.source_health,
+            'tracked': self.scanner.store.count
+        }, interval=config.get('scan_refresh_minutes', 15) * 60, on_result=self.on_scan_result)
+        # Every reply goes through one paced outbox (Telegram flood limits)
+        self.outbox = MessageQueue()
+        # Chats that get pushed new airdrops, seeded with config's filter / notification settings
+        self.subscriptions = Subscriptions(config.get('db_path', 'airdrops.db'), defaults=config)
+    
+    async def post_init(self, application):
+        """Start background work once the application is up"""
+        with startup_profiler.phase('post_init'):
+            self.outbox.start(application.bot)
+            self.daemon.start()
+        startup_profiler.mark('ready')
+    
+    async def post_shutdown(self, application):
+        await self.daemon.stop()
+        await self.outbox.stop()
+    
+    async def on_scan_result(self, job, result):
+        """Push each scan's new / updated airdrops to matching subscribers"""
+        if job == 'changes':
+            notified = self.subscriptions.fan_out(result, self.outbox)
+            if notified:
+                logger.info(f"📣 Queued alerts for {notified} subscribers")
+        
+    async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Start command - Welcome message"""
+        welcome_text = templates.render('welcome')
         
         keyboard = [
             [
@@ -67,7 +188,7 @@ Let's start earning! 💰
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await update.message.reply_text(
+        await self.outbox.reply(update,
             welcome_text,
             parse_mode='Markdown',
             reply_markup=reply_markup
@@ -75,11 +196,13 @@ Let's start earning! 💰
     
     async def hotstuff_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """HotStuff L1 information and opportunities"""
-        await update.message.reply_text("🔥 Loading HotStuff L1 info... Please wait...")
+        await self.outbox.reply(update, "🔥 Loading HotStuff L1 info... Please wait...")
         
         try:
             # Get HotStuff notification
-            message = get_hotstuff_notification()
+            # Fetches hotstuff.trade - keep it off the event loop
+            message = await run_io(get_hotstuff_notification,
+                                   timeout=self.config.get('hotstuff_timeout_seconds', 15))
             
             # Add action buttons
             keyboard = [
@@ -89,49 +212,56 @@ Let's start earning! 💰
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await update.message.reply_text(
+            await self.outbox.reply(update,
                 message,
                 parse_mode='Markdown',
                 reply_markup=reply_markup,
                 disable_web_page_preview=True
             )
             
+        except asyncio.TimeoutError:
+            logger.warning("hotstuff command timed out")
+            await self.outbox.reply(update, "⏱️ HotStuff is slow to respond. Please try again later.")
         except Exception as e:
             logger.error(f"Error in hotstuff command: {e}")
-            await update.message.reply_text("❌ Error loading HotStuff info. Please try again.")
+            await self.outbox.reply(update, "❌ Error loading HotStuff info. Please try again.")
     
     async def scan_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Scan for new airdrops"""
-        await update.message.reply_text("🔍 Scanning for new airdrops... Please wait...")
-        
         try:
-            # Get current airdrops
-            airdrops = self.scanner.get_current_airdrops()
+            # Served from the background scan - no waiting on sources
+            snapshot = self.daemon.snapshot
+            airdrops = snapshot.get('airdrops', ())
+            changes = snapshot.get('changes')
             
             if airdrops:
-                message = "✅ *Active FREE Airdrops Found!*\n\n"
+                def build():
+                    new_listings = ""
+                    if changes and changes['added']:
+                        new_listings = f"🆕 {len(changes['added'])} new listings since the last scan\n\n"
+                    listings = "\n\n".join(
+                        f"*{i}. {airdrop['name']}* ({airdrop['status']})\n"
+                        f"   💰 Value: {airdrop['value']}\n"
+                        f"   ⏱️ Time: {airdrop['time']}\n"
+                        f"   💵 Cost: {airdrop['cost']}\n"
+                        f"   🔗 Link: {airdrop['website']}"
+                        for i, airdrop in enumerate(airdrops, 1)
+                    )
+                    return {'new_listings': new_listings, 'airdrops': listings}
                 
-                for i, airdrop in enumerate(airdrops, 1):
-                    message += f"*{i}. {airdrop['name']}* ({airdrop['status']})\n"
-                    message += f"   💰 Value: {airdrop['value']}\n"
-                    message += f"   ⏱️ Time: {airdrop['time']}\n"
-                    message += f"   💵 Cost: {airdrop['cost']}\n"
-                    message += f"   🔗 Link: {airdrop['website']}\n\n"
+                message = templates.render('scan', version=snapshot.version, build=build)
                 
-                message += "💡 *NEW:* Try /hotstuff for HotStuff L1 testnet opportunities!\n\n"
-                message += "Use /claim to get direct claim links!"
-                
-                await update.message.reply_text(message, parse_mode='Markdown')
+                await self.outbox.reply(update, message, parse_mode='Markdown')
             else:
-                await update.message.reply_text("❌ No new airdrops found. Try /hotstuff for HotStuff L1!")
+                await self.outbox.reply(update, "❌ No new airdrops found. Try /hotstuff for HotStuff L1!")
                 
         except Exception as e:
             logger.error(f"Error in scan: {e}")
-            await update.message.reply_text("❌ Error scanning airdrops. Please try again.")
+            await self.outbox.reply(update, "❌ Error scanning airdrops. Please try again.")
     
     async def claim_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Get claim links for active airdrops"""
-        airdrops = self.scanner.get_current_airdrops()
+        airdrops = self.daemon.snapshot.get('airdrops', ())
         
         message = "🎯 *CLAIM THESE AIRDROPS NOW!*\n\n"
         
@@ -170,7 +300,7 @@ Let's start earning! 💰
         
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await update.message.reply_text(
+        await self.outbox.reply(update,
             message,
             parse_mode='Markdown',
             reply_markup=reply_markup,
@@ -179,54 +309,35 @@ Let's start earning! 💰
     
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Check current airdrop status"""
-        airdrops = self.scanner.get_current_airdrops()
-        
-        message = "📊 *CURRENT AIRDROP STATUS*\n\n"
-        message += f"🎯 Active Airdrops: {len(airdrops) + 1}\n"  # +1 for HotStuff
-        message += f"💰 Total Potential Value: $30-1500+\n"
-        message += f"⏱️ Total Time Required: ~60 minutes\n"
-        message += f"💵 Total Cost: FREE\n\n"
+        snapshot = self.daemon.snapshot
+        airdrops = snapshot.get('airdrops', ())
         
-        message += "*Breakdown:*\n"
-        for airdrop in airdrops:
-            message += f"• {airdrop['name']}: {airdrop['value']}\n"
+        def build():
+            sources = []
+            for name, health in snapshot.get('health', {}).items():
+                if health is None:
+                    sources.append(f"• {name}: not scanned yet")
+                else:
+                    sources.append(f"• {HEALTH_ICONS[health['state']]} {name}: {health['health']}/100")
+            return {
+                'active_count': len(airdrops) + 1,  # +1 for HotStuff
+                'tracked': snapshot.get('tracked', 0),
+                'sources': "\n".join(sources),
+                'breakdown': templates.bullets(f"{airdrop['name']}: {airdrop['value']}" for airdrop in airdrops)
+            }
         
-        message += f"• 🔥 HotStuff L1: High potential (8/10)\n\n"
+        message = templates.render('status', version=snapshot.version, build=build)
         
-        message += "Use /claim to start earning!\n"
-        message += "Use /hotstuff for HotStuff details!"
+        # Queue stats change every second - appended live, outside the cached text
+        outbox = self.outbox.metrics()
+        latency = outbox['latency']['p95_ms'] if outbox['latency'] else 0
+        message += f"\n\n📬 Outbox: {outbox['depth']} queued, p95 delivery {latency:.0f}ms"
         
-        await update.message.reply_text(message, parse_mode='Markdown')
+        await self.outbox.reply(update, message, parse_mode='Markdown')
     
     async def stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """View earnings statistics"""
-        message = """
-📈 *YOUR AIRDROP STATISTICS*
-
-🎯 *Current Active:*
-   • T-Rex: 1170 points
-   • PrismaX: 1782 points
-   • Hotstuff: 1265 points
-   • 🔥 HotStuff L1: Testnet active
-
-💰 *Estimated Value:*
-   • Conservative: $35-185
-   • Realistic: $185-750
-   • Optimistic: $750-1850+
-
-⏱️ *Time Investment:*
-   • Setup: 5 minutes (one-time)
-   • Daily: 10-15 minutes
-   • Total this month: ~5 hours
-
-📊 *ROI:*
-   • Potential: $50-500+/month
-   • Hourly rate: $10-100/hour
-   • Cost: $0 (FREE!)
-
-🔥 *Keep claiming daily for maximum earnings!*
-💡 *Don't miss HotStuff L1 testnet - use /hotstuff*
-        """
+        message = templates.render('stats')
         
         keyboard = [
             [InlineKeyboardButton("💰 Claim Now", callback_data='claim')],
@@ -235,7 +346,7 @@ Let's start earning! 💰
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await update.message.reply_text(
+        await self.outbox.reply(update,
             message,
             parse_mode='Markdown',
             reply_markup=reply_markup
@@ -269,7 +380,7 @@ Use /settings to configure reminder times.
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await update.message.reply_text(
+        await self.outbox.reply(update,
             message,
             parse_mode='Markdown',
             reply_markup=reply_markup
@@ -277,25 +388,9 @@ Use /settings to configure reminder times.
     
     async def settings_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Bot settings"""
-        message = """
-⚙️ *BOT SETTINGS*
-
-*Current Configuration:*
-✅ Auto-scan: Enabled
-✅ Notifications: Enabled
-✅ Daily reminders: Enabled
-✅ HotStuff tracking: Enabled
-
-*Customize:*
-• Reminder times
-• Notification preferences
-• Airdrop filters
-• Auto-claim settings
-
-Edit config.json file to customize settings.
-        """
+        message = templates.render('settings')
         
-        await update.message.reply_text(message, parse_mode='Markdown')
+        await self.outbox.reply(update, message, parse_mode='Markdown')
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Help message"""
@@ -317,42 +412,68 @@ Edit config.json file to customize settings.
         elif query.data == 'settings':
             await self.settings_command(update, context)
         elif query.data == 'enable_remind':
-            await query.edit_message_text("✅ Daily reminders enabled! You'll receive notifications at 9 AM, 10:30 AM, and 8 PM.")
+            self.subscriptions.subscribe(update.effective_chat.id)
+            await query.edit_message_text("✅ Daily reminders enabled! You'll receive notifications at 9 AM, 10:30 AM, and 8 PM.\n\n🆕 New airdrops will be sent here as soon as they're found. Use /unsubscribe to stop.")
+    
+    async def unsubscribe_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Stop new airdrop alerts"""
+        if self.subscriptions.unsubscribe(update.effective_chat.id):
+            await self.outbox.reply(update, "🔕 Unsubscribed. Use /remind to turn alerts back on.")
+        else:
+            await self.outbox.reply(update, "You're not subscribed. Use /remind to enable alerts.")
     
     def run(self):
         """Run the bot"""
         try:
             # Create application
-            self.app = Application.builder().token(self.token).build()
+            # The background scan starts and stops with the application
+            with startup_profiler.phase('build'):
+                self.app = (
+                    Application.builder()
+                    .token(self.token)
+                    # Handle updates concurrently so one slow command doesn't hold up other chats
+                    .concurrent_updates(self.config.get('concurrent_updates', 64))
+                    .post_init(self.post_init)
+                    .post_shutdown(self.post_shutdown)
+                    .build()
+                )
             
             # Add command handlers
-            self.app.add_handler(CommandHandler("start", self.start))
-            self.app.add_handler(CommandHandler("scan", self.scan_command))
-            self.app.add_handler(CommandHandler("claim", self.claim_command))
-            self.app.add_handler(CommandHandler("hotstuff", self.hotstuff_command))
-            self.app.add_handler(CommandHandler("status", self.status_command))
-            self.app.add_handler(CommandHandler("stats", self.stats_command))
-            self.app.add_handler(CommandHandler("remind", self.remind_command))
-            self.app.add_handler(CommandHandler("settings", self.settings_command))
-            self.app.add_handler(CommandHandler("help", self.help_command))
+            with startup_profiler.phase('handlers'):
+                self.app.add_handler(CommandHandler("start", self.start))
+                self.app.add_handler(CommandHandler("scan", self.scan_command))
+                self.app.add_handler(CommandHandler("claim", self.claim_command))
+                self.app.add_handler(CommandHandler("hotstuff", self.hotstuff_command))
+                self.app.add_handler(CommandHandler("status", self.status_command))
+                self.app.add_handler(CommandHandler("stats", self.stats_command))
+                self.app.add_handler(CommandHandler("remind", self.remind_command))
+                self.app.add_handler(CommandHandler("unsubscribe", self.unsubscribe_command))
+                self.app.add_handler(CommandHandler("settings", self.settings_command))
+                self.app.add_handler(CommandHandler("help", self.help_command))
+            
+                # Add callback handler for buttons
+                self.app.add_handler(CallbackQueryHandler(self.button_callback))
             
-            # Add callback handler for buttons
-            self.app.add_handler(CallbackQueryHandler(self.button_callback))
+            startup_profiler.watch_first_update(self.app)
             
             # Start bot
             logger.info("🚀 Telegram bot started!")
             logger.info("🔥 HotStuff L1 integration active!")
-            self.app.run_polling(allowed_updates=Update.ALL_TYPES)
+            # Webhooks when WEBHOOK_URL is set, long-polling otherwise
+            run_application(self.app, allowed_updates=Update.ALL_TYPES)
             
         except Exception as e:
             logger.error(f"Error running bot: {e}")
             raise
+        finally:
+            shutdown_executors(wait=False)
 
 def main():
     """Main function"""
+    startup_profiler.mark('main')
     try:
         # Load config
-        with open('config.json', 'r') as f:
+        with startup_profiler.phase('config'), open('config.json', 'r') as f:
             config = json.load(f)
         
         # Get bot token
@@ -361,7 +482,8 @@ def main():
             raise ValueError("Telegram bot token not found in config.json")
         
         # Create and run bot
-        bot = TelegramAirdropBot(token, config)
+        with startup_profiler.phase('init'):
+            bot = TelegramAirdropBot(token, config)
         bot.run()
         
     except FileNotFoundError:
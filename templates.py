@@ -0,0 +1,111 @@
+"""
+Templates - message templates compiled once, rendered once per data version
+A handler renders `(template, version)`; the text is built the first time
+and served from memory until the version changes (e.g. a new scan
+snapshot). Static messages have no fields, so they are rendered on first
+use and then always served from the cache.
+
+    templates.register('status', '''
+    📊 *STATUS*
+    Active: {count}
+    ''')
+    message = templates.render('status', version=snapshot.version, count=len(airdrops))
+"""
+
+import string
+import textwrap
+
+_formatter = string.Formatter()
+
+
+def bullets(items, fmt="• {}"):
+    """Lines for a list field: bullets(['a', 'b']) -> '• a\\n• b'"""
+    return "\n".join(fmt.format(item) for item in items)
+
+
+class Template:
+    """
+    A str.format template, dedented and checked at load time
+
+    Args:
+        name: Template name (for errors and the cache)
+        source: Template text; {field} placeholders, {{ / }} for literal braces
+    """
+
+    def __init__(self, name, source):
+        self.name = name
+        self.source = textwrap.dedent(source).strip("\n")
+        # Parse now so a malformed template fails at import, not mid-command
+        self.fields = {
+            field.split('.')[0].split('[')[0]
+            for _, field, _, _ in _formatter.parse(self.source) if field
+        }
+        if any(not field or field.isdigit() for field in self.fields):
+            raise ValueError(f"Template {name!r} must use named fields")
+
+    def render(self, **data):
+        missing = self.fields - data.keys()
+        if missing:
+            raise KeyError(f"Template {self.name!r} missing fields: {', '.join(sorted(missing))}")
+        return self.source.format_map(data)
+
+
+class TemplateRenderer:
+    """Registered templates plus the latest rendering of each, keyed by data version"""
+
+    def __init__(self):
+        self.templates = {}
+        self._rendered = {}  # name -> (version, text)
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, name, source):
+        self.templates[name] = Template(name, source)
+        self._rendered.pop(name, None)
+        return self.templates[name]
+
+    def render(self, name, version=None, build=None, **data):
+        """
+        Text for `name` at `version`; only re-rendered when the version changes
+
+        Args:
+            name: Registered template
+            version: Anything hashable that changes when `data` does (snapshot
+                     version, a status tuple...). Templates without fields can omit it.
+            build: Optional zero-argument callable returning extra field values,
+                   only called on a miss (for data that is costly to gather)
+            **data: Field values
+        """
+        cached = self._rendered.get(name)
+        if cached is not None and cached[0] == version:
+            self.hits += 1
+            return cached[1]
+
+        self.misses += 1
+        if build is not None:
+            data = {**build(), **data}
+        text = self.templates[name].render(**data)
+        self._rendered[name] = (version, text)  # older versions are dropped
+        return text
+
+    def invalidate(self, name=None):
+        """Forget one rendered template, or all of them"""
+        if name is None:
+            self._rendered.clear()
+        else:
+            self._rendered.pop(name, None)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'templates': len(self.templates),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 3) if total else None,
+        }
+
+
+# Shared renderer for the bots
+renderer = TemplateRenderer()
+register = renderer.register
+render = renderer.render
@@ -0,0 +1,466 @@
+"""
+Vector Index - in-memory embedding collections for semantic search
+Embeddings live in one contiguous float32 matrix with unit-length rows, so
+cosine similarity against every document is a single matrix-vector product
+and top-k is an argpartition instead of a full sort.
+
+For large collections an IVF mode clusters rows around k-means centroids
+and only scores the `nprobe` closest clusters - recall traded for latency
+(see benchmarks/bench_vector_index.py for operating points).
+
+    index = VectorIndex()
+    docs = index.create('airdrops', dimension=1536)          # exact
+    docs = index.create('tweets', dimension=1536, mode='ivf', nprobe=8)
+    ids = docs.add(vectors, texts, metadata)
+    for doc_id, score in docs.search(query_vector, top_k=5):
+        print(docs.get(doc_id)['text'], score)
+    docs.save('tweets.npz'); docs = load_collection('tweets.npz')
+"""
+
+import json
+import os
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+INITIAL_CAPACITY = 64
+ASSIGN_CHUNK = 8192  # rows per block when assigning rows to centroids
+
+
+def normalize_rows(vectors):
+    """Copy of `vectors` as a 2-D float32 array with unit-length rows (zero rows stay zero)"""
+    matrix = np.array(vectors, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+    return matrix
+
+
+def top_k_indices(scores, top_k):
+    """Positions of the `top_k` highest scores, best first"""
+    if top_k >= len(scores):
+        return np.argsort(scores)[::-1]
+    best = np.argpartition(scores, -top_k)[-top_k:]
+    return best[np.argsort(scores[best])[::-1]]
+
+
+def assign_clusters(vectors, centroids):
+    """Nearest centroid (by inner product) of each row, in blocks to bound memory"""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK):
+        block = vectors[start:start + ASSIGN_CHUNK]
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def train_centroids(vectors, nlist, iterations=10, sample_size=None, seed=0):
+    """
+    Spherical k-means over unit-length rows
+
+    Args:
+        vectors: (n, dimension) normalized rows
+        nlist: Number of centroids
+        iterations: Lloyd iterations
+        sample_size: Rows to train on (default 256 per centroid)
+        seed: Random seed, for reproducible clusters
+
+    Returns:
+        (nlist, dimension) float32 unit-length centroids
+    """
+    rng = np.random.default_rng(seed)
+    sample_size = min(len(vectors), sample_size or nlist * 256)
+    sample = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        labels = assign_clusters(sample, centroids)
+        order = np.argsort(labels, kind='stable')
+        counts = np.bincount(labels, minlength=nlist)
+        used = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[used]
+        centroids[used] = np.add.reduceat(sample[order], starts, axis=0)
+        # Empty clusters restart from random rows
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            centroids[empty] = sample[rng.choice(len(sample), len(empty), replace=False)]
+        centroids = normalize_rows(centroids)
+    return centroids
+
+
+class VectorCollection:
+    """
+    One collection of documents and their embeddings
+
+    Rows are kept dense: deleting a document moves the last row into its
+    slot, so search never skips holes.
+
+    Args:
+        dimension: Embedding size
+        name: Collection name
+    """
+
+    def __init__(self, dimension, name='default'):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for vector search (pip install numpy)")
+        self.name = name
+        self.dimension = dimension
+        self.size = 0
+        self.vectors = np.zeros((INITIAL_CAPACITY, dimension), dtype=np.float32)
+        self.row_ids = np.zeros(INITIAL_CAPACITY, dtype=np.int64)  # row -> document id
+        self.rows = {}  # document id -> row
+        self.documents = {}  # document id -> {'text', 'metadata'}
+        self.next_id = 0
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, doc_id):
+        return doc_id in self.rows
+
+    def _reserve(self, count):
+        """Grow the matrix (doubling) so `count` more rows fit"""
+        needed = self.size + count
+        capacity = len(self.vectors)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        vectors = np.zeros((capacity, self.dimension), dtype=np.float32)
+        vectors[:self.size] = self.vectors[:self.size]
+        row_ids = np.zeros(capacity, dtype=np.int64)
+        row_ids[:self.size] = self.row_ids[:self.size]
+        self.vectors, self.row_ids = vectors, row_ids
+
+    def add(self, vectors, texts, metadata=None, ids=None):
+        """
+        Add documents
+
+        Args:
+            vectors: (n, dimension) embeddings (any scale - rows are normalized here)
+            texts: n document texts
+            metadata: Optional list of n metadata dicts
+            ids: Optional n new document IDs (default: the next free ones)
+
+        Returns:
+            List of new document IDs
+        """
+        matrix = normalize_rows(vectors)
+        if matrix.shape[1] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-dim vectors, got {matrix.shape[1]}")
+        if len(texts) != len(matrix) or (metadata is not None and len(metadata) != len(matrix)):
+            raise ValueError("vectors, texts and metadata must have the same length")
+
+        count = len(matrix)
+        self._reserve(count)
+        start = self.size
+        ids = list(range(self.next_id, self.next_id + count)) if ids is None else list(ids)
+        self.vectors[start:start + count] = matrix
+        self.row_ids[start:start + count] = ids
+        for offset, doc_id in enumerate(ids):
+            self.rows[doc_id] = start + offset
+            self.documents[doc_id] = {
+                'text': texts[offset],
+                'metadata': metadata[offset] if metadata is not None else {}
+            }
+        self.size += count
+        self.next_id = max(self.next_id, max(ids) + 1) if ids else self.next_id
+        return ids
+
+    def delete(self, ids):
+        """Remove documents by ID; returns how many existed"""
+        deleted = 0
+        for doc_id in ids:
+            row = self.rows.pop(doc_id, None)
+            if row is None:
+                continue
+            del self.documents[doc_id]
+            self._remove_row(row)
+            deleted += 1
+        return deleted
+
+    def _remove_row(self, row):
+        """Fill `row` with the last row and shrink by one"""
+        last = self.size - 1
+        if row != last:
+            moved = int(self.row_ids[last])
+            self.vectors[row] = self.vectors[last]
+            self.row_ids[row] = moved
+            self.rows[moved] = row
+        self.size = last
+
+    def get(self, doc_id):
+        """{'id', 'text', 'metadata'} for a document, None if unknown"""
+        document = self.documents.get(doc_id)
+        if document is None:
+            return None
+        return {'id': doc_id, **document}
+
+    def search(self, query_vector, top_k=5):
+        """
+        Most similar documents by cosine similarity
+
+        Returns:
+            List of (document ID, score), best first
+        """
+        if self.size == 0 or top_k <= 0:
+            return []
+        query = normalize_rows(query_vector)[0]
+        scores = self.vectors[:self.size] @ query
+        best = top_k_indices(scores, top_k)
+        return [(int(self.row_ids[row]), float(scores[row])) for row in best]
+
+    # ==================== Persistence ====================
+
+    def _meta(self):
+        return {
+            'mode': 'exact',
+            'name': self.name,
+            'dimension': self.dimension,
+            'next_id': self.next_id,
+            'documents': [
+                [doc_id, document['text'], document['metadata']]
+                for doc_id, document in self.documents.items()
+            ]
+        }
+
+    def _arrays(self):
+        return {'vectors': self.vectors[:self.size], 'row_ids': self.row_ids[:self.size]}
+
+    def save(self, path):
+        """Write the collection to one .npz file (atomically)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, meta=np.array(json.dumps(self._meta())), **self._arrays())
+        os.replace(tmp_path, path)
+
+    def _restore(self, meta, arrays):
+        count = len(arrays['row_ids'])
+        self._reserve(count)
+        self.vectors[:count] = arrays['vectors']
+        self.row_ids[:count] = arrays['row_ids']
+        self.size = count
+        self.rows = {int(doc_id): row for row, doc_id in enumerate(arrays['row_ids'])}
+        self.documents = {doc_id: {'text': text, 'metadata': metadata}
+                          for doc_id, text, metadata in meta['documents']}
+        self.next_id = meta['next_id']
+
+
+class IVFCollection(VectorCollection):
+    """
+    Approximate collection: an inverted file over k-means clusters
+
+    Until `train_size` documents exist (or train() is called) it searches
+    exactly. Training clusters the rows; after that each insert is filed
+    under its nearest centroid and a search scores only the rows in the
+    `nprobe` best clusters. Raise nprobe for recall, lower it for speed.
+
+    Args:
+        dimension: Embedding size
+        name: Collection name
+        nlist: Number of clusters (default about 4 * sqrt(n) at training time)
+        nprobe: Clusters scanned per query
+        train_size: Document count that triggers training on insert
+    """
+
+    def __init__(self, dimension, name='default', nlist=None, nprobe=8, train_size=10_000):
+        super().__init__(dimension, name)
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.train_size = train_size
+        self.centroids = None
+        self.lists = []  # cluster -> rows in it
+        self.assignments = np.zeros(len(self.vectors), dtype=np.int32)  # row -> cluster
+        self.positions = np.zeros(len(self.vectors), dtype=np.int64)  # row -> index in its list
+
+    @property
+    def trained(self):
+        return self.centroids is not None
+
+    def _reserve(self, count):
+        super()._reserve(count)
+        capacity = len(self.vectors)
+        if len(self.assignments) < capacity:
+            self.assignments = np.resize(self.assignments, capacity)
+            self.positions = np.resize(self.positions, capacity)
+
+    def train(self, nlist=None, iterations=10, seed=0):
+        """Cluster the current rows and rebuild the inverted lists"""
+        if self.size == 0:
+            raise ValueError("Cannot train an empty collection")
+        nlist = nlist or self.nlist or int(4 * np.sqrt(self.size))
+        self.nlist = max(1, min(nlist, self.size))
+        self.centroids = train_centroids(self.vectors[:self.size], self.nlist, iterations, seed=seed)
+        self._build_lists(assign_clusters(self.vectors[:self.size], self.centroids))
+
+    def _build_lists(self, labels):
+        self.lists = [[] for _ in range(len(self.centroids))]
+        self.assignments[:self.size] = labels
+        for row, cluster in enumerate(labels.tolist()):
+            self.positions[row] = len(self.lists[cluster])
+            self.lists[cluster].append(row)
+
+    def add(self, vectors, texts, metadata=None):
+        start = self.size
+        ids = super().add(vectors, texts, metadata)
+        if self.trained:
+            labels = assign_clusters(self.vectors[start:self.size], self.centroids)
+            for row, cluster in enumerate(labels.tolist(), start):
+                self.assignments[row] = cluster
+                self.positions[row] = len(self.lists[cluster])
+                self.lists[cluster].append(row)
+        elif self.size >= self.train_size:
+            self.train()
+        return ids
+
+    def _remove_row(self, row):
+        if self.trained:
+            # Take `row` out of its list (swap with the list's last entry)
+            members = self.lists[self.assignments[row]]
+            position = self.positions[row]
+            tail = members.pop()
+            if tail != row:
+                members[position] = tail
+                self.positions[tail] = position
+            # The collection's last row is about to move into `row`
+            last = self.size - 1
+            if row != last:
+                cluster = self.assignments[last]
+                self.lists[cluster][self.positions[last]] = row
+                self.assignments[row] = cluster
+                self.positions[row] = self.positions[last]
+        super()._remove_row(row)
+
+    def search(self, query_vector, top_k=5, nprobe=None):
+        """
+        Approximate nearest documents (exact until trained)
+
+        Args:
+            query_vector: Query embedding
+            top_k: Number of results
+            nprobe: Clusters to scan (default self.nprobe)
+
+        Returns:
+            List of (document ID, score), best first
+        """
+        if not self.trained:
+            return super().search(query_vector, top_k)
+        if self.size == 0 or top_k <= 0:
+            return []
+
+        query = normalize_rows(query_vector)[0]
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+        probe = top_k_indices(self.centroids @ query, nprobe)
+        candidates = np.fromiter(
+            (row for cluster in probe for row in self.lists[cluster]), dtype=np.int64
+        )
+        if len(candidates) == 0:
+            return []
+        scores = self.vectors[candidates] @ query
+        best = top_k_indices(scores, top_k)
+        return [(int(self.row_ids[candidates[i]]), float(scores[i])) for i in best]
+
+    def _meta(self):
+        meta = super()._meta()
+        meta.update(mode='ivf', nlist=self.nlist, nprobe=self.nprobe, train_size=self.train_size)
+        return meta
+
+    def _arrays(self):
+        arrays = super()._arrays()
+        if self.trained:
+            arrays['centroids'] = self.centroids
+            arrays['assignments'] = self.assignments[:self.size]
+        return arrays
+
+    def _restore(self, meta, arrays):
+        super()._restore(meta, arrays)
+        if 'centroids' in arrays:
+            self.centroids = arrays['centroids']
+            self._build_lists(arrays['assignments'])
+
+
+COLLECTION_TYPES = {'exact': VectorCollection, 'ivf': IVFCollection}
+
+
+def load_collection(path):
+    """Collection saved with .save(path)"""
+    with np.load(path, allow_pickle=False) as data:
+        arrays = {key: data[key] for key in data.files if key != 'meta'}
+        meta = json.loads(str(data['meta']))
+    options = {key: meta[key] for key in ('nlist', 'nprobe', 'train_size') if key in meta}
+    collection = COLLECTION_TYPES[meta['mode']](meta['dimension'], meta['name'], **options)
+    collection._restore(meta, arrays)
+    return collection
+
+
+class VectorIndex:
+    """
+    Named vector collections
+
+    Args:
+        directory: Where 'disk' collections live (vector_store.DiskCollection);
+                   saved collections there are opened on first use
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.collections = {}
+
+    def create(self, name, dimension, mode='exact', **options):
+        """
+        New empty collection (replaces an existing one with the same name)
+
+        Args:
+            name: Collection name
+            dimension: Embedding size
+            mode: 'exact', 'ivf' or 'disk' (needs a directory)
+            **options: IVFCollection settings (nlist, nprobe, train_size)
+                       or DiskCollection settings (merge_threshold)
+        """
+        if mode == 'disk':
+            from vector_store import DiskCollection
+            if not self.directory:
+                raise ValueError("'disk' collections need a VectorIndex directory")
+            self.collections[name] = DiskCollection.create(self._disk_path(name), dimension, name, **options)
+            return self.collections[name]
+        if mode not in COLLECTION_TYPES:
+            raise ValueError(f"Unknown index mode {mode!r} (use {', '.join(COLLECTION_TYPES)})")
+        self.collections[name] = COLLECTION_TYPES[mode](dimension, name, **options)
+        return self.collections[name]
+
+    def load(self, path, name=None):
+        """Load a saved collection, optionally under a new name"""
+        collection = load_collection(path)
+        if name:
+            collection.name = name
+        self.collections[collection.name] = collection
+        return collection
+
+    def _disk_path(self, name):
+        return os.path.join(self.directory, name)
+
+    def get(self, name):
+        """A collection by name, opening it from the directory if it was saved there"""
+        collection = self.collections.get(name)
+        if collection is None and self.directory:
+            from vector_store import DiskCollection
+            if DiskCollection.exists(self._disk_path(name)):
+                collection = self.collections[name] = DiskCollection(self._disk_path(name))
+        return collection
+
+    def drop(self, name):
+        """Forget a collection (files of a disk collection are left in place)"""
+        collection = self.collections.pop(name, None)
+        if collection is not None and hasattr(collection, 'close'):
+            collection.close()
+        return collection is not None
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def close(self):
+        """Close every open collection"""
+        for name in list(self.collections):
+            self.drop(name)
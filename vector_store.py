@@ -0,0 +1,538 @@
+"""
+Vector Store - on-disk vector collections opened with np.memmap
+Opening a collection maps its files instead of reading them, so startup
+doesn't depend on collection size and every bot process on the machine
+shares one copy of the vectors through the OS page cache.
+
+New documents are appended to a small segment file; once segments (or
+deletions) pass `merge_threshold` rows they are merged into a new base in
+a background thread and the collection switches to it atomically.
+
+Collection directory:
+    meta.json           dimension, current base generation, segments, deleted IDs
+    base-<g>.f32        raw float32 matrix, one unit-length row per document
+    base-<g>.ids        int64 document ID of each row (ascending)
+    base-<g>.jsonl      [id, text, metadata] per row
+    base-<g>.offsets    int64 byte offset of each row's line, plus the end
+    segment-<n>.f32     appended rows not merged yet (same row format)
+    segment-<n>.jsonl
+
+One process writes a collection; any number of processes may open it
+for reading. Every append, delete and merge rewrites meta.json, and readers
+stat it on each search / get, so they see changes without reopening.
+
+    docs = DiskCollection.create('vectors/airdrops', dimension=1536)
+    docs.add(vectors, texts, metadata)
+    docs = DiskCollection('vectors/airdrops')   # later, or in another worker
+    docs.search(query_vector, top_k=5)
+"""
+
+import json
+import os
+import threading
+
+from vector_index import NUMPY_AVAILABLE, VectorCollection, normalize_rows, top_k_indices
+
+if NUMPY_AVAILABLE:
+    import numpy as np
+
+FORMAT_VERSION = 1
+META_FILE = 'meta.json'
+MERGE_THRESHOLD = 10_000  # segment rows or deleted IDs that trigger a merge
+COPY_CHUNK_BYTES = 4 << 20  # vector bytes copied per block during a merge
+LOAD_ATTEMPTS = 5  # re-reads of meta.json when a merge deletes files the one we read listed
+
+
+class _Segment:
+    """Rows appended since the last merge: in memory plus their append-only files"""
+
+    def __init__(self, number, collection, vector_file=None, docs_file=None):
+        self.number = number
+        self.collection = collection
+        self.vector_file = vector_file
+        self.docs_file = docs_file
+        self.docs_bytes = 0  # how much of the .jsonl file has been read back
+
+    def close(self):
+        for f in (self.vector_file, self.docs_file):
+            if f is not None:
+                f.close()
+        self.vector_file = self.docs_file = None
+
+
+class DiskCollection:
+    """
+    Memory-mapped collection with the VectorCollection interface
+    (add, delete, get, search, len)
+
+    Args:
+        path: Collection directory (made by DiskCollection.create)
+        merge_threshold: Segment rows / deleted IDs that start a background merge
+    """
+
+    def __init__(self, path, merge_threshold=MERGE_THRESHOLD):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for vector search (pip install numpy)")
+        self.path = path
+        self.merge_threshold = merge_threshold
+        self._lock = threading.RLock()
+        self._merge_thread = None
+        self._active = None
+        self._load()
+
+    @classmethod
+    def create(cls, path, dimension, name=None, **options):
+        """New empty collection at `path` (replaces one that is already there)"""
+        os.makedirs(path, exist_ok=True)
+        for filename in os.listdir(path):
+            if filename == META_FILE or filename.startswith(('base-', 'segment-')):
+                os.remove(os.path.join(path, filename))
+        _write_json(os.path.join(path, META_FILE), {
+            'format': FORMAT_VERSION,
+            'name': name or os.path.basename(os.path.normpath(path)),
+            'dimension': dimension,
+            'generation': 0,
+            'count': 0,
+            'next_id': 0,
+            'segments': [],
+            'deleted': []
+        })
+        return cls(path, **options)
+
+    @staticmethod
+    def exists(path):
+        return os.path.exists(os.path.join(path, META_FILE))
+
+    # ==================== Loading ====================
+
+    def _file(self, filename):
+        return os.path.join(self.path, filename)
+
+    def _meta_state(self):
+        """Cheap change detector for meta.json (it is replaced, never edited in place)"""
+        stat = os.stat(self._file(META_FILE))
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _read_meta(self):
+        state = self._meta_state()
+        with open(self._file(META_FILE)) as f:
+            meta = json.load(f)
+        if meta.get('format') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported vector store format in {self.path}: {meta.get('format')}")
+        return meta, state
+
+    def _load(self):
+        """Open the collection as meta.json describes it"""
+        for attempt in range(LOAD_ATTEMPTS):
+            meta, state = self._read_meta()
+            try:
+                self._open(meta)
+            except FileNotFoundError:
+                # A merge replaced meta.json and removed the files ours listed; read the new one
+                if attempt == LOAD_ATTEMPTS - 1:
+                    raise
+                continue
+            self._meta_key = state
+            return
+
+    def _open(self, meta):
+        self.name = meta['name']
+        self.dimension = meta['dimension']
+        self.generation = meta['generation']
+        self._base = self._map_base(self.generation, meta['count'])
+        self._sealed = []
+        self._apply_meta(meta)
+        self._next_segment = max(meta['segments'] + [0]) + 1
+
+    def _apply_meta(self, meta):
+        """Catch up on segment rows and deletes listed in `meta` (same base generation)"""
+        known = {segment.number: segment for segment in self._sealed}
+        rows = meta.get('segment_rows', {})
+        self._sealed = [
+            self._load_segment(number, rows.get(str(number)), known.get(number))
+            for number in meta['segments']
+        ]
+        self.deleted = set(meta['deleted'])
+        self.next_id = max([meta['next_id']] + [segment.collection.next_id for segment in self._sealed])
+        if self._base['count']:
+            self.next_id = max(self.next_id, int(self._base['ids'][-1]) + 1)
+        self._update_deleted()
+
+    def _map_base(self, generation, count):
+        """Map a base generation's files (nothing is read until it's searched)"""
+        if count == 0:
+            return {
+                'count': 0,
+                'vectors': np.zeros((0, self.dimension), dtype=np.float32),
+                'ids': np.zeros(0, dtype=np.int64),
+                'offsets': np.zeros(1, dtype=np.int64),
+                'docs': np.zeros(0, dtype=np.uint8)
+            }
+        prefix = self._file(f'base-{generation}')
+        return {
+            'count': count,
+            'vectors': np.memmap(f'{prefix}.f32', dtype=np.float32, mode='r', shape=(count, self.dimension)),
+            'ids': np.memmap(f'{prefix}.ids', dtype=np.int64, mode='r', shape=(count,)),
+            'offsets': np.memmap(f'{prefix}.offsets', dtype=np.int64, mode='r', shape=(count + 1,)),
+            'docs': np.memmap(f'{prefix}.jsonl', dtype=np.uint8, mode='r')
+        }
+
+    def _load_segment(self, number, committed=None, segment=None):
+        """
+        Read a segment's rows back, or only the ones `segment` doesn't have yet
+
+        Args:
+            number: Segment number
+            committed: Rows meta.json vouches for (older metas: all complete rows)
+            segment: Already-loaded segment to top up
+        """
+        segment = segment or _Segment(number, VectorCollection(self.dimension, self.name))
+        have = segment.collection.size
+        if committed is not None and committed <= have:
+            return segment
+
+        prefix = self._file(f'segment-{number}')
+        with open(f'{prefix}.f32', 'rb') as f:
+            f.seek(have * self.dimension * 4)
+            vectors = np.fromfile(f, dtype=np.float32)
+        with open(f'{prefix}.jsonl', 'rb') as f:
+            f.seek(segment.docs_bytes)
+            lines = [line for line in f.readlines() if line.endswith(b'\n')]  # a torn append is ignored
+        count = min(len(vectors) // self.dimension, len(lines))
+        if committed is not None:
+            count = min(count, committed - have)
+
+        if count:
+            rows = [json.loads(line) for line in lines[:count]]
+            segment.collection.add(
+                vectors[:count * self.dimension].reshape(count, self.dimension),
+                [text for _, text, _ in rows],
+                [metadata for _, _, metadata in rows],
+                ids=[doc_id for doc_id, _, _ in rows]
+            )
+            segment.docs_bytes += sum(len(line) for line in lines[:count])
+        return segment
+
+    def refresh(self):
+        """
+        Pick up another process's appends, deletes and merges
+
+        Costs one stat() when nothing changed; search, get and len call it.
+
+        Returns:
+            True if the collection changed
+        """
+        with self._lock:
+            state = self._meta_state()
+            if state == self._meta_key:
+                return False
+            if self._active is not None:
+                # This process is the writer; its in-memory state is the newest
+                self._meta_key = state
+                return False
+            meta, state = self._read_meta()
+            if meta['generation'] == self.generation:
+                try:
+                    self._apply_meta(meta)  # only new segment rows / deletes
+                    self._meta_key = state
+                    return True
+                except FileNotFoundError:
+                    pass  # merged away since we read meta.json; _load() reads the new one
+            self._load()
+            return True
+
+    # ==================== Bookkeeping ====================
+
+    def _segments(self):
+        return self._sealed + ([self._active] if self._active else [])
+
+    def _base_row(self, doc_id):
+        ids = self._base['ids']
+        row = int(np.searchsorted(ids, doc_id))
+        return row if row < len(ids) and ids[row] == doc_id else None
+
+    def _update_deleted(self):
+        """Cache deleted IDs as an array and as base rows, for masking search scores"""
+        self._deleted_ids = np.array(sorted(self.deleted), dtype=np.int64)
+        ids = self._base['ids']
+        rows = np.searchsorted(ids, self._deleted_ids)
+        found = rows < len(ids)
+        found[found] = ids[rows[found]] == self._deleted_ids[found]
+        self._deleted_rows = rows[found]
+
+    def _write_meta(self, durable=False):
+        segments = self._segments()
+        _write_json(self._file(META_FILE), {
+            'format': FORMAT_VERSION,
+            'name': self.name,
+            'dimension': self.dimension,
+            'generation': self.generation,
+            'count': self._base['count'],
+            'next_id': self.next_id,
+            'segments': [segment.number for segment in segments],
+            'segment_rows': {str(segment.number): segment.collection.size for segment in segments},
+            'deleted': sorted(self.deleted)
+        }, durable)
+        self._meta_key = self._meta_state()
+
+    def _active_segment(self):
+        if self._active is None:
+            prefix = self._file(f'segment-{self._next_segment}')
+            self._active = _Segment(
+                self._next_segment,
+                VectorCollection(self.dimension, self.name),
+                open(f'{prefix}.f32', 'ab'),
+                open(f'{prefix}.jsonl', 'a')
+            )
+            self._next_segment += 1
+            self._write_meta()
+        return self._active
+
+    # ==================== Collection API ====================
+
+    def __len__(self):
+        self.refresh()
+        return self._base['count'] + sum(len(segment.collection) for segment in self._segments()) - len(self.deleted)
+
+    def __contains__(self, doc_id):
+        return self.get(doc_id) is not None
+
+    def add(self, vectors, texts, metadata=None):
+        """Append documents to the active segment; returns their IDs"""
+        matrix = normalize_rows(vectors)
+        if matrix.shape[1] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-dim vectors, got {matrix.shape[1]}")
+        metadata = metadata if metadata is not None else [{} for _ in texts]
+
+        with self._lock:
+            segment = self._active_segment()
+            ids = list(range(self.next_id, self.next_id + len(matrix)))
+            segment.collection.add(matrix, texts, metadata, ids=ids)
+            # Vectors first: a torn write leaves extra vector bytes, which loading ignores
+            segment.vector_file.write(matrix.tobytes())
+            segment.vector_file.flush()
+            segment.docs_file.write(''.join(
+                json.dumps([doc_id, text, meta]) + '\n' for doc_id, text, meta in zip(ids, texts, metadata)
+            ))
+            segment.docs_file.flush()
+            self.next_id += len(ids)
+            self._write_meta()  # readers only trust rows meta.json lists
+            self._maybe_merge()
+        return ids
+
+    def delete(self, ids):
+        """Mark documents deleted (rows disappear at the next merge); returns how many existed"""
+        with self._lock:
+            deleted = 0
+            for doc_id in ids:
+                if doc_id not in self.deleted and self._exists(doc_id):
+                    self.deleted.add(doc_id)
+                    deleted += 1
+            if deleted:
+                self._update_deleted()
+                self._write_meta()
+                self._maybe_merge()
+        return deleted
+
+    def _exists(self, doc_id):
+        return (self._base_row(doc_id) is not None
+                or any(doc_id in segment.collection for segment in self._segments()))
+
+    def get(self, doc_id):
+        """{'id', 'text', 'metadata'} for a document, None if unknown or deleted"""
+        self.refresh()
+        with self._lock:
+            if doc_id in self.deleted:
+                return None
+            for segment in self._segments():
+                document = segment.collection.get(doc_id)
+                if document is not None:
+                    return document
+            base = self._base
+            row = self._base_row(doc_id)
+        if row is None:
+            return None
+        line = bytes(base['docs'][base['offsets'][row]:base['offsets'][row + 1]])
+        _, text, metadata = json.loads(line)
+        return {'id': doc_id, 'text': text, 'metadata': metadata}
+
+    def search(self, query_vector, top_k=5):
+        """
+        Most similar documents by cosine similarity (exact, over base and segments)
+
+        Returns:
+            List of (document ID, score), best first
+        """
+        if top_k <= 0:
+            return []
+        self.refresh()
+        with self._lock:
+            base, deleted_rows, deleted_ids = self._base, self._deleted_rows, self._deleted_ids
+            segments = [(segment.collection.vectors, segment.collection.row_ids, segment.collection.size)
+                        for segment in self._segments()]
+
+        query = normalize_rows(query_vector)[0]
+        candidates = []
+        blocks = [(base['vectors'], base['ids'], base['count'], deleted_rows)]
+        for vectors, row_ids, size in segments:
+            blocks.append((vectors, row_ids, size, np.flatnonzero(np.isin(row_ids[:size], deleted_ids))))
+
+        for vectors, row_ids, size, masked in blocks:
+            if size == 0:
+                continue
+            scores = np.asarray(vectors[:size] @ query)
+            scores[masked] = -np.inf
+            for row in top_k_indices(scores, top_k):
+                if scores[row] == -np.inf:
+                    break
+                candidates.append((int(row_ids[row]), float(scores[row])))
+
+        candidates.sort(key=lambda item: item[1], reverse=True)
+        return candidates[:top_k]
+
+    # ==================== Merging ====================
+
+    def _maybe_merge(self):
+        segment_rows = sum(len(segment.collection) for segment in self._segments())
+        if segment_rows >= self.merge_threshold or len(self.deleted) >= self.merge_threshold:
+            self.compact(background=True)
+
+    @property
+    def merging(self):
+        return self._merge_thread is not None and self._merge_thread.is_alive()
+
+    def compact(self, background=False):
+        """
+        Merge segments into a new base and drop deleted rows
+
+        Args:
+            background: Run in a daemon thread (searches and appends continue meanwhile)
+
+        Returns:
+            The merge thread if background, else True if anything was merged
+        """
+        with self._lock:
+            if self.merging:
+                return self._merge_thread
+            if background:
+                self._merge_thread = threading.Thread(target=self._merge, name=f'merge-{self.name}', daemon=True)
+                self._merge_thread.start()
+                return self._merge_thread
+        return self._merge()
+
+    def _merge(self):
+        with self._lock:
+            # Seal the active segment; appends from here on start a new one
+            if self._active is not None:
+                self._active.close()
+                self._sealed.append(self._active)
+                self._active = None
+            if not self._sealed and not self.deleted:
+                return False
+            base, sealed, deleted = self._base, list(self._sealed), self._deleted_ids
+            generation = self.generation + 1
+
+        count = self._write_base(generation, base, sealed, deleted)
+
+        with self._lock:
+            merged = {segment.number for segment in sealed}
+            old_generation = self.generation
+            self._sealed = [segment for segment in self._sealed if segment.number not in merged]
+            self.deleted -= set(deleted.tolist())  # deletes made during the merge still apply
+            self.generation = generation
+            self._base = self._map_base(generation, count)
+            self._update_deleted()
+            self._write_meta(durable=True)
+
+        # Other processes may still map the old files; on POSIX that's fine
+        stale = [f'base-{old_generation}.{ext}' for ext in ('f32', 'ids', 'jsonl', 'offsets')]
+        stale += [f'segment-{number}.{ext}' for number in merged for ext in ('f32', 'jsonl')]
+        for filename in stale:
+            try:
+                os.remove(self._file(filename))
+            except OSError:
+                pass
+        return True
+
+    def _write_base(self, generation, base, sealed, deleted):
+        """Write base + sealed segments - deleted rows as `generation`; returns its row count"""
+        prefix = self._file(f'base-{generation}')
+        chunk = max(1, COPY_CHUNK_BYTES // (4 * self.dimension))  # rows per block, so memory stays flat
+        written = {'rows': 0, 'offset': 0}
+        with open(f'{prefix}.f32', 'wb') as vector_file, open(f'{prefix}.ids', 'wb') as id_file, \
+                open(f'{prefix}.jsonl', 'wb') as docs_file, open(f'{prefix}.offsets', 'wb') as offset_file:
+            np.zeros(1, dtype=np.int64).tofile(offset_file)
+
+            def write_rows(vectors, ids, lines):
+                # Contiguous slices (e.g. of the base memmap) are written without a copy
+                np.ascontiguousarray(vectors, dtype=np.float32).tofile(vector_file)
+                np.ascontiguousarray(ids, dtype=np.int64).tofile(id_file)
+                lengths = []
+                for line in lines:
+                    docs_file.write(line)
+                    lengths.append(len(line))
+                if lengths:
+                    ends = written['offset'] + np.cumsum(lengths, dtype=np.int64)
+                    ends.tofile(offset_file)
+                    written['offset'] = int(ends[-1])
+                    written['rows'] += len(lengths)
+
+            def base_line(row):
+                return bytes(base['docs'][base['offsets'][row]:base['offsets'][row + 1]])
+
+            for start in range(0, base['count'], chunk):
+                stop = min(start + chunk, base['count'])
+                ids = np.asarray(base['ids'][start:stop])
+                keep = ~np.isin(ids, deleted)
+                if keep.all():
+                    write_rows(base['vectors'][start:stop], ids, map(base_line, range(start, stop)))
+                else:
+                    rows = np.flatnonzero(keep) + start
+                    write_rows(base['vectors'][rows], ids[keep], map(base_line, rows))
+
+            # Segments are append-only, so their rows are already in ID order
+            for segment in sealed:
+                collection = segment.collection
+                for start in range(0, collection.size, chunk):
+                    ids = collection.row_ids[start:min(start + chunk, collection.size)]
+                    rows = np.flatnonzero(~np.isin(ids, deleted)) + start
+                    write_rows(collection.vectors[rows], collection.row_ids[rows], (
+                        (json.dumps([doc_id, collection.documents[doc_id]['text'],
+                                     collection.documents[doc_id]['metadata']]) + '\n').encode()
+                        for doc_id in collection.row_ids[rows].tolist()
+                    ))
+
+            # Make the new base durable before meta.json can point at it
+            for f in (vector_file, id_file, docs_file, offset_file):
+                f.flush()
+                os.fsync(f.fileno())
+
+        return written['rows']
+
+    def close(self):
+        """Wait for a running merge and close the segment files"""
+        thread = self._merge_thread
+        if thread is not None:
+            thread.join()
+        with self._lock:
+            if self._active is not None:
+                self._active.close()
+                self._sealed.append(self._active)
+                self._active = None
+
+
+def _write_json(path, data, durable=False):
+    """Atomically replace `path`; durable also fsyncs the file and its directory"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if durable and hasattr(os, 'O_DIRECTORY'):
+        fd = os.open(os.path.dirname(path) or '.', os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
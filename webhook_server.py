@@ -0,0 +1,150 @@
+"""
+Webhook Server - receive Telegram updates over HTTPS instead of long-polling
+An aiohttp server on $PORT (8080 on Fly) accepts updates from Telegram,
+checks the secret token and hands them to the application's normal handlers.
+
+Environment:
+    WEBHOOK_URL     Public base URL, e.g. https://crypto-airdrop-bot.fly.dev
+    WEBHOOK_SECRET  Secret token Telegram echoes back (random per start if unset)
+    WEBHOOK_PATH    Path updates are posted to (default /telegram)
+    BOT_MODE        'webhook' or 'polling' (default: webhook when WEBHOOK_URL is set)
+    PORT            Port to listen on (default 8080)
+
+    from webhook_server import run_application
+    run_application(application)  # webhook if configured, long-polling otherwise
+"""
+
+import asyncio
+import hmac
+import importlib.util
+import logging
+import os
+import secrets
+import signal
+
+from telegram import Update
+
+# aiohttp is only imported in webhook mode - it costs ~200ms of cold start
+AIOHTTP_AVAILABLE = importlib.util.find_spec('aiohttp') is not None
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = 'X-Telegram-Bot-Api-Secret-Token'
+
+
+def webhook_mode():
+    """True when the bot should serve webhooks instead of polling"""
+    mode = os.getenv('BOT_MODE', '').lower()
+    if mode == 'polling':
+        return False
+    if not os.getenv('WEBHOOK_URL'):
+        if mode == 'webhook':
+            logger.warning("BOT_MODE=webhook but WEBHOOK_URL is not set - falling back to polling")
+        return False
+    if not AIOHTTP_AVAILABLE:
+        logger.warning("aiohttp not installed - falling back to polling")
+        return False
+    return True
+
+
+def create_app(application, secret, path):
+    """aiohttp app with the update endpoint and a health check"""
+    from aiohttp import web
+
+    async def handle_update(request):
+        # Compare bytes: str compare_digest raises TypeError on non-ASCII input
+        token = request.headers.get(SECRET_HEADER, '')
+        if not hmac.compare_digest(token.encode(), secret.encode()):
+            return web.Response(status=403)
+        try:
+            data = await request.json()
+        except ValueError:
+            return web.Response(status=400)
+        if not isinstance(data, dict):
+            return web.Response(status=400)
+        try:
+            update = Update.de_json(data, application.bot)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return web.Response(status=400)
+        if update is None:  # de_json({}) returns None
+            return web.Response(status=400)
+
+        # Queue and return right away; the application processes updates in the background
+        await application.update_queue.put(update)
+        return web.Response()
+
+    async def health(request):
+        return web.json_response({
+            'status': 'ok' if application.running else 'starting',
+            'mode': 'webhook',
+            'pending_updates': application.update_queue.qsize()
+        })
+
+    app = web.Application()
+    app.router.add_post(path, handle_update)
+    app.router.add_get('/health', health)
+    return app
+
+
+async def serve(application, webhook_url, secret=None, path='/telegram', port=8080,
+                allowed_updates=None):
+    """
+    Run the application behind the webhook server until SIGINT / SIGTERM
+
+    Mirrors Application.run_polling: initialize, post_init, start ... stop,
+    post_stop, shutdown, post_shutdown.
+    """
+    from aiohttp import web
+
+    secret = secret or secrets.token_urlsafe(32)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    runner = web.AppRunner(create_app(application, secret, path))
+    await application.initialize()
+    try:
+        if application.post_init:
+            await application.post_init(application)
+
+        await runner.setup()
+        await web.TCPSite(runner, '0.0.0.0', port).start()
+        await application.bot.set_webhook(
+            url=webhook_url.rstrip('/') + path,
+            secret_token=secret,
+            allowed_updates=allowed_updates
+        )
+        await application.start()
+        logger.info(f"🌐 Webhook server listening on :{port}{path}")
+
+        await stop.wait()
+    finally:
+        await runner.cleanup()
+        if application.running:
+            await application.stop()
+        if application.post_stop:
+            await application.post_stop(application)
+        await application.shutdown()
+        if application.post_shutdown:
+            await application.post_shutdown(application)
+
+
+def run_application(application, allowed_updates=Update.ALL_TYPES):
+    """Serve webhooks if configured, otherwise long-poll"""
+    if not webhook_mode():
+        logger.info("📡 Using long-polling")
+        application.run_polling(allowed_updates=allowed_updates)
+        return
+
+    asyncio.run(serve(
+        application,
+        webhook_url=os.getenv('WEBHOOK_URL'),
+        secret=os.getenv('WEBHOOK_SECRET'),
+        path=os.getenv('WEBHOOK_PATH', '/telegram'),
+        port=int(os.getenv('PORT', '8080')),
+        allowed_updates=allowed_updates
+    ))